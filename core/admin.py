@@ -44,6 +44,7 @@ class PuzzleAdmin(MarkdownxModelAdmin):
         "slug",
     )
     list_filter = ("is_meta", "unlockable__hunt")
+    list_select_related = ("unlockable",)
     inlines = (SaltedAnswerInline,)
     autocomplete_fields = ("unlockable",)
 
@@ -89,6 +90,7 @@ class UnlockableAdmin(MarkdownxModelAdmin):
         "parent",
         "hunt",
         "round",
+        "unlock_needs",
     )
     autocomplete_fields = (
         "hunt",
@@ -105,6 +107,7 @@ class SolutionAdmin(MarkdownxModelAdmin):
         "post_solve_image_path",
         "post_solve_image_alt",
     )
+    list_select_related = ("puzzle",)
     search_fields = (
         "puzzle__name",
         "post_solve_story",
@@ -127,4 +130,5 @@ class SaltedAnswerAdmin(admin.ModelAdmin[SaltedAnswer]):
         "is_correct",
         "is_canonical",
     )
+    list_select_related = ("puzzle",)
     autocomplete_fields = ("puzzle",)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from . import signals  # NOQA
+        from .logs import start_queue_listeners
+        from .rendering import connect_render_on_save
+
+        start_queue_listeners()
+        connect_render_on_save()
@@ -0,0 +1,63 @@
+"""ETags for the solver-facing pages, so that revisits get a 304.
+
+A page only depends on its URL, on the puzzle content, on the solver's
+progress kept in the session, on whether the viewer is staff, and on
+which start, end and unlock dates have passed. The ETag digests exactly
+those, so it can be checked before any of the view runs."""
+
+import json
+from functools import wraps
+from hashlib import sha256
+from typing import Any
+
+from django.contrib import messages
+from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.cache import quote_etag
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .snapshot import get_catalog
+from .utils import is_staff
+
+# the session keys a page can show or depend on
+SESSION_KEYS = ("solved", "opened", "courage", "name")
+
+
+def page_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> str | None:
+    if len(messages.get_messages(request)):
+        return None  # the messages have to be shown by a full render
+    catalog = get_catalog()
+    state = [
+        request.path,
+        catalog.version,
+        is_staff(request.user),
+        catalog.epoch(timezone.now()),
+        {k: request.session.get(k) for k in SESSION_KEYS},
+    ]
+    return sha256(
+        json.dumps(state, sort_keys=True, default=str).encode("UTF-8")
+    ).hexdigest()[:32]
+
+
+def conditional_page(view: Any) -> Any:
+    """Decorate a view function so it answers with 304
+    when the client already has the current page."""
+
+    @wraps(view)
+    def tagged(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        response = view(request, *args, **kwargs)
+        # opening a page changes the session, and so the tag the next visit
+        # will be checked against; the page sent is the one after that
+        if request.session.modified and (etag := page_etag(request)) is not None:
+            response.headers["ETag"] = quote_etag(etag)
+        return response
+
+    # no-cache: browsers may keep the page, but must revalidate every time
+    return cache_control(private=True, no_cache=True)(
+        condition(etag_func=page_etag)(tagged)
+    )
+
+
+conditional_dispatch = method_decorator(conditional_page, name="dispatch")
@@ -1,13 +1,57 @@
+import random
+from datetime import UTC, timedelta
+
 from django.contrib.auth import get_user_model
+from factory.declarations import LazyAttribute, LazyFunction, Sequence, SubFactory
 from factory.django import DjangoModelFactory
 from factory.faker import Faker
 
-from core.models import Hunt
+from core.models import Hunt, Puzzle, Round, SaltedAnswer, Solution, Unlockable
 from evans_django_tools.testsuite import UniqueFaker
 
 User = get_user_model()
 
 
+def markdown_body(paragraphs: int = 4) -> str:
+    """Markdown using the extensions the site renders with:
+    headings, emphasis, lists, tables, footnotes and code."""
+    rng = random.Random()
+    words = [
+        "frisk",
+        "asriel",
+        "toriel",
+        "sans",
+        "papyrus",
+        "undyne",
+        "alphys",
+        "mettaton",
+        "determination",
+        "courage",
+        "ruins",
+        "snowdin",
+        "waterfall",
+        "hotland",
+    ]
+
+    def sentence() -> str:
+        s = [rng.choice(words) for _ in range(rng.randint(6, 14))]
+        s[rng.randrange(len(s))] = f"*{rng.choice(words)}*"
+        s[rng.randrange(len(s))] = f"**{rng.choice(words)}**"
+        return " ".join(s).capitalize() + "."
+
+    blocks = [f"## {rng.choice(words).capitalize()}"]
+    for i in range(paragraphs):
+        blocks.append(" ".join(sentence() for _ in range(rng.randint(2, 5))))
+        if i % 3 == 1:
+            blocks.append("\n".join(f"- {sentence()}" for _ in range(4)))
+        if i % 4 == 2:
+            rows = [f"| {rng.choice(words)} | {rng.randint(1, 99)} |" for _ in range(5)]
+            blocks.append("\n".join(["| Name | Value |", "| --- | --- |", *rows]))
+    blocks.append(f'Some "quotes" -- and a footnote.[^1]\n\n[^1]: {sentence()}')
+    blocks.append(f"```python\nprint('{rng.choice(words)}')\n```")
+    return "\n\n".join(blocks)
+
+
 class UserFactory(DjangoModelFactory):
     class Meta:
         model = User
@@ -22,7 +66,61 @@ class HuntFactory(DjangoModelFactory):
     class Meta:
         model = Hunt
 
+    volume_number = Sequence(lambda n: f"V{n}")
     name = Faker("catch_phrase")
     authors = Faker("company")
-    start_date = Faker("date_time")
+    start_date = Faker("date_time", tzinfo=UTC)
+    end_date = LazyAttribute(lambda o: o.start_date + timedelta(days=60))
     visible = False
+
+
+class UnlockableFactory(DjangoModelFactory):
+    class Meta:
+        model = Unlockable
+
+    hunt = SubFactory(HuntFactory)
+    slug = Sequence(lambda n: f"unlockable-{n}")
+    name = Faker("city")
+    icon = "🧩"
+    intro_story_text = LazyFunction(lambda: markdown_body(2))
+
+
+class RoundFactory(DjangoModelFactory):
+    class Meta:
+        model = Round
+
+    unlockable = SubFactory(UnlockableFactory, icon="📖")
+    name = Faker("street_name")
+    chapter_number = Sequence(lambda n: str(n))
+    slug = Sequence(lambda n: f"round-{n}")
+    round_text = LazyFunction(markdown_body)
+
+
+class PuzzleFactory(DjangoModelFactory):
+    class Meta:
+        model = Puzzle
+
+    unlockable = SubFactory(UnlockableFactory)
+    name = Faker("catch_phrase")
+    slug = Sequence(lambda n: f"puzzle-{n}")
+    flavor_text = Faker("sentence")
+    content = LazyFunction(lambda: markdown_body(8))
+
+
+class SolutionFactory(DjangoModelFactory):
+    class Meta:
+        model = Solution
+
+    puzzle = SubFactory(PuzzleFactory)
+    post_solve_story = LazyFunction(lambda: markdown_body(2))
+    solution_text = LazyFunction(lambda: markdown_body(6))
+    author_notes = LazyFunction(lambda: markdown_body(1))
+
+
+class SaltedAnswerFactory(DjangoModelFactory):
+    class Meta:
+        model = SaltedAnswer
+
+    puzzle = SubFactory(PuzzleFactory)
+    display_answer = Faker("word")
+    salt = Sequence(lambda n: n % 10**4)
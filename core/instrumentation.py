@@ -0,0 +1,287 @@
+"""Per-request counts of SQL queries and of time spent in the database,
+in templates and in Markdown, grouped by URL name.
+
+The middleware keeps a rolling window of samples for every URL name,
+shown by the staff stats view, and can add a Server-Timing header so the
+numbers show up in the browser's network panel. Views with an entry in
+``QUERY_BUDGETS`` are checked against it on every request."""
+
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from django.template.response import SimpleTemplateResponse
+
+from .routers import primary
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    __slots__ = (
+        "db_time",
+        "mkd_time",
+        "parent",
+        "queries",
+        "template_time",
+        "warming_up",
+        "warmup_queries",
+    )
+
+    def __init__(self, parent: "RequestMetrics | None" = None):
+        self.parent = parent
+        self.queries = 0
+        self.warmup_queries = 0
+        self.warming_up = False
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.mkd_time = 0.0
+
+    def record(self, elapsed: float, warming_up: bool = False):
+        warming_up = warming_up or self.warming_up
+        self.db_time += elapsed
+        self.queries += 1
+        if warming_up:
+            self.warmup_queries += 1
+        if self.parent is not None:
+            self.parent.record(elapsed, warming_up)
+
+    @property
+    def budgeted_queries(self) -> int:
+        return self.queries - self.warmup_queries
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("metrics", default=None)
+
+
+def percentile(values: Sequence[float], p: int) -> float:
+    """The `p`th percentile of `values`, interpolated between the samples;
+    never below the smallest or above the largest."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def _execute(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: Any,
+) -> Any:
+    if (metrics := _current.get()) is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record(time.perf_counter() - start)
+
+
+def _install(connection: BaseDatabaseWrapper):
+    # first, so the pop at the end of a connection.execute_wrapper() block
+    # never takes it off
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _execute)
+
+
+@receiver(connection_created, dispatch_uid="instrumentation")
+def _on_connection_created(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any):
+    # connections are per thread, and under ASGI the ORM runs in other threads
+    # than the request; the context variable follows it there
+    _install(connection)
+
+
+@contextmanager
+def timed(field: str) -> Iterator[None]:
+    """Add the time spent in the block to `field` of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if (metrics := _current.get()) is not None:
+            setattr(
+                metrics, field, getattr(metrics, field) + time.perf_counter() - start
+            )
+
+
+@contextmanager
+def warming_up() -> Iterator[None]:
+    """Queries filling the shared in-memory caches happen once per content
+    version rather than once per request, so they don't count against budgets.
+    They read from the primary, never a replica that may lag behind it."""
+    metrics = _current.get()
+    with primary():
+        if metrics is None or metrics.warming_up:
+            yield
+            return
+        metrics.warming_up = True
+        try:
+            yield
+        finally:
+            metrics.warming_up = False
+
+
+@contextmanager
+def count_queries() -> Iterator[RequestMetrics]:
+    """Count the queries run in the block, on every database connection
+    and in every thread the block hands work to with sync_to_async."""
+    for connection in connections.all():
+        _install(connection)
+    metrics = RequestMetrics(parent=_current.get())
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(limit: int) -> Iterator[RequestMetrics]:
+    """For tests: fail if the block runs more than `limit` queries."""
+    with count_queries() as metrics:
+        yield metrics
+    if metrics.budgeted_queries > limit:
+        raise QueryBudgetExceeded(
+            f"{metrics.budgeted_queries} queries, budget is {limit}"
+        )
+
+
+class RollingSummary:
+    """The last `window` samples for each URL name."""
+
+    FIELDS = ("total_ms", "queries", "db_ms", "template_ms", "mkd_ms")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples: dict[str, deque[tuple[float, ...]]] = {}
+
+    def record(self, url_name: str, sample: tuple[float, ...]):
+        with self.lock:
+            if url_name not in self.samples:
+                self.samples[url_name] = deque(maxlen=self.window)
+            self.samples[url_name].append(sample)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        with self.lock:
+            snapshot = {name: list(samples) for name, samples in self.samples.items()}
+        result: dict[str, dict[str, Any]] = {}
+        for name, samples in sorted(snapshot.items()):
+            result[name] = {"count": len(samples)}
+            for i, field in enumerate(self.FIELDS):
+                values = [sample[i] for sample in samples]
+                result[name][field] = {
+                    "mean": round(statistics.mean(values), 2),
+                    "p50": round(statistics.median(values), 2),
+                    "p95": round(percentile(values, 95), 2),
+                    "max": round(max(values), 2),
+                }
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+
+rolling_summary = RollingSummary(
+    window=getattr(settings, "INSTRUMENTATION_WINDOW", 500)
+)
+
+
+def _add_template_time(start: float, metrics: RequestMetrics, response: Any):
+    metrics.template_time += time.perf_counter() - start
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with count_queries() as metrics:
+            response = self.get_response(request)
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        with count_queries() as metrics:
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics, start)
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: RequestMetrics,
+        start: float,
+    ) -> HttpResponse:
+        total = time.perf_counter() - start
+
+        match = request.resolver_match
+        url_name = match.url_name if match is not None and match.url_name else "-"
+        rolling_summary.record(
+            url_name,
+            (
+                total * 1000,
+                metrics.queries,
+                metrics.db_time * 1000,
+                metrics.template_time * 1000,
+                metrics.mkd_time * 1000,
+            ),
+        )
+
+        if getattr(settings, "SERVER_TIMING", False):
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;desc="{metrics.queries} queries";dur={metrics.db_time * 1000:.1f}',
+                    f"tpl;dur={metrics.template_time * 1000:.1f}",
+                    f"mkd;dur={metrics.mkd_time * 1000:.1f}",
+                    f"total;dur={total * 1000:.1f}",
+                ]
+            )
+
+        budget = getattr(settings, "QUERY_BUDGETS", {}).get(url_name)
+        if budget is not None and metrics.budgeted_queries > budget:
+            message = (
+                f"{url_name} ran {metrics.budgeted_queries} queries, budget is {budget}"
+            )
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_template_response(
+        self, request: HttpRequest, response: SimpleTemplateResponse
+    ) -> SimpleTemplateResponse:
+        # called right before the template is rendered
+        if (metrics := _current.get()) is not None:
+            response.add_post_render_callback(
+                partial(_add_template_time, time.perf_counter(), metrics)
+            )
+        return response
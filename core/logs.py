@@ -0,0 +1,192 @@
+"""Logging helpers: the guess event stream, a JSON formatter for it,
+a listener that batches records for webhooks, and starting the listeners
+of queue handlers set up in ``LOGGING``.
+
+Records reach slow handlers through a ``QueueHandler``, so writing them
+happens on the listener's thread rather than the request's. This module
+is imported while logging is configured, before the apps are ready,
+so it must not import models."""
+
+import atexit
+import json
+import logging
+import random
+import threading
+import time
+from logging.handlers import QueueListener
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.crypto import salted_hmac
+
+if TYPE_CHECKING:
+    from .models import Puzzle, SaltedAnswer
+
+guess_logger = logging.getLogger("core.guesses")
+
+_started: list[QueueListener] = []
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the fields of the record's `event`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+        }
+        event = getattr(record, "event", None)
+        if isinstance(event, dict):
+            fields.update(event)
+        else:
+            fields["message"] = record.getMessage()
+        return json.dumps(fields)
+
+
+class BatchingQueueListener(QueueListener):
+    """Hands records to its handlers in batches, for sinks like the Discord
+    webhook where every record is an HTTP request and a burst of them
+    would be rate limited anyway.
+
+    Records arriving within `interval` seconds of the first are sent
+    as one, with repeats of the same message counted instead of resent.
+    Batches go out at most `per_minute` times a minute; records keep
+    collecting in the meantime, and past `max_records` different messages
+    the rest are only counted. Only the public `handle` and `stop` are
+    overridden: a timer sends each batch, and stopping sends what is left."""
+
+    def __init__(
+        self,
+        queue: Any,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+        interval: float | None = None,
+        per_minute: int | None = None,
+        max_records: int | None = None,
+    ):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.interval = interval or getattr(settings, "LOG_BATCH_SECONDS", 5)
+        self.gap = 60 / (per_minute or getattr(settings, "LOG_BATCHES_PER_MINUTE", 6))
+        self.max_records = max_records or getattr(settings, "LOG_BATCH_RECORDS", 20)
+        self.pending: dict[tuple[int, str], list[Any]] = {}
+        self.dropped = 0
+        self.next_send = 0.0
+        self.lock = threading.Lock()
+        self.timer: threading.Timer | None = None
+
+    def collect(self, record: logging.LogRecord):
+        key = (record.levelno, record.getMessage())
+        if (entry := self.pending.get(key)) is not None:
+            entry[1] += 1
+        elif len(self.pending) < self.max_records:
+            self.pending[key] = [record, 1]
+        else:
+            self.dropped += 1
+
+    def combine(self) -> logging.LogRecord:
+        entries = list(self.pending.values())
+        if len(entries) == 1 and entries[0][1] == 1 and not self.dropped:
+            return entries[0][0]
+        worst = max((record for record, _ in entries), key=lambda r: r.levelno)
+        parts = []
+        for record, count in entries:
+            message = record.getMessage()
+            parts.append(message if count == 1 else f"{message}\n(repeated {count}x)")
+        if self.dropped:
+            parts.append(f"... and {self.dropped} more records")
+        return logging.makeLogRecord(
+            dict(
+                worst.__dict__,
+                msg="\n\n".join(parts),
+                args=None,
+                exc_info=None,
+                exc_text=None,
+                message=None,
+            )
+        )
+
+    def handle(self, record: logging.LogRecord):
+        """Add the record to the batch, and start the batch's timer
+        if it is the first."""
+        record = self.prepare(record)
+        with self.lock:
+            self.collect(record)
+            if self.timer is None:
+                delay = max(self.interval, self.next_send - time.monotonic())
+                self.timer = threading.Timer(delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            self.timer = None
+            if not self.pending:
+                return
+            batch = self.combine()
+            self.pending.clear()
+            self.dropped = 0
+            self.next_send = time.monotonic() + self.gap
+        super().handle(batch)
+
+    def stop(self):
+        super().stop()
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+        self.flush()
+
+
+def start_queue_listeners():
+    """dictConfig builds a listener for every queue handler with `handlers`,
+    but leaves starting it to us."""
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    for logger in loggers:
+        for handler in logger.handlers:
+            listener = getattr(handler, "listener", None)
+            if isinstance(listener, QueueListener) and listener not in _started:
+                listener.start()
+                atexit.register(listener.stop)
+                _started.append(listener)
+
+
+def solver_id(request: HttpRequest) -> str:
+    """Stable for one browser, and meaningless without the secret key."""
+    value = f"{request.META.get('REMOTE_ADDR', '')} {request.META.get('HTTP_USER_AGENT', '')}"
+    return salted_hmac("core.guesses", value).hexdigest()[:12]
+
+
+def log_guess(
+    request: HttpRequest,
+    action: str,
+    puzzle: "Puzzle",
+    sa: "SaltedAnswer | None",
+    started: float,
+):
+    """Record how a guess was graded. Solves are always kept; wrong and
+    partial guesses, which are most of a launch, are sampled."""
+    outcome = "wrong" if sa is None else "correct" if sa.is_correct else "partial"
+    if not guess_logger.isEnabledFor(logging.INFO):
+        return
+    if outcome != "correct" and random.random() >= settings.GUESS_LOG_SAMPLE_RATE:
+        return
+    guess_logger.info(
+        "%s %s %s",
+        action,
+        puzzle.slug,
+        outcome,
+        extra={
+            "event": {
+                "action": action,
+                "volume": puzzle.hunt_volume_number,
+                "puzzle": puzzle.slug,
+                "outcome": outcome,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                "solver": solver_id(request),
+            }
+        },
+    )
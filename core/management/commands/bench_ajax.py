@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.management.commands.bench_views import build_hunt, stats
+from core.models import Puzzle, SaltedAnswer
+from core.versions import bump_version
+
+MODES = ("sync", "async")
+
+
+class Command(BaseCommand):
+    help = (
+        "Time bursts of guesses hitting /ajax right after the content changes, "
+        "with the sync view behind the WSGI handler and the async view behind "
+        "the ASGI handler, each in its own process"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--burst", type=int, default=200, help="Guesses in every burst"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=16, help="Guesses in flight at once"
+        )
+        parser.add_argument("--bursts", type=int, default=5)
+        parser.add_argument(
+            "--mode",
+            choices=MODES,
+            help="Run one mode in this process; by default both run in children",
+        )
+        parser.add_argument("--output", help="Write the report here, not to stdout")
+
+    def handle(self, *args: Any, **options: Any):
+        if options["mode"] is None:
+            report = {mode: self.spawn(mode, options) for mode in MODES}
+            for mode in MODES:
+                result = report[mode]["results"]
+                self.stderr.write(
+                    f"{mode:>5}: {result['requests_per_second']:>8.1f} req/s, "
+                    f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms"
+                )
+        else:
+            report = self.run_mode(options)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def spawn(self, mode: str, options: dict[str, Any]) -> dict[str, Any]:
+        # urls.py picks the view once, so each mode needs a fresh process
+        env = dict(os.environ, ASYNC_AJAX="1" if mode == "async" else "")
+        with tempfile.NamedTemporaryFile("r", suffix=".json") as f:
+            argv = [sys.executable, sys.argv[0], "bench_ajax", "--mode", mode]
+            argv += ["--output", f.name]
+            for name in ("burst", "concurrency", "bursts"):
+                argv += [f"--{name}", str(options[name])]
+            child = subprocess.run(
+                argv, check=False, env=env, capture_output=True, text=True
+            )
+            if child.returncode != 0:
+                raise CommandError(f"{mode} run failed:\n{child.stderr}")
+            return json.load(f)
+
+    def run_mode(self, options: dict[str, Any]) -> dict[str, Any]:
+        mode = options["mode"]
+        if settings.ASYNC_AJAX != (mode == "async"):
+            raise CommandError(f"Set ASYNC_AJAX to run the {mode} view")
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            build_hunt("AJAX", chapters=2, puzzles=8, depth=1, answers=4)
+            guesses = self.guesses(options)
+            samples: list[float] = []
+            wall = 0.0
+            for burst in guesses:
+                # the moment after an unlock: every cached copy is stale
+                bump_version()
+                start = time.perf_counter()
+                if mode == "async":
+                    samples += asyncio.run(self.async_burst(burst, options))
+                else:
+                    samples += self.sync_burst(burst, options)
+                wall += time.perf_counter() - start
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        result = stats(samples, [0])
+        del result["max_queries"]
+        result["requests_per_second"] = round(len(samples) / wall, 1)
+        return {
+            "config": {
+                k: options[k] for k in ("mode", "burst", "concurrency", "bursts")
+            },
+            "results": result,
+        }
+
+    def guesses(self, options: dict[str, Any]) -> list[list[dict[str, Any]]]:
+        """Bursts of guesses the browser found a salt for, right and nearly right,
+        spread over the puzzles of one round."""
+        rng = random.Random(1)
+        answers: dict[int, list[SaltedAnswer]] = {}
+        for sa in SaltedAnswer.objects.all():
+            answers.setdefault(sa.puzzle_id, []).append(sa)
+        puzzles = list(Puzzle.objects.filter(unlockable__parent__isnull=False))
+        bursts = []
+        for _ in range(options["bursts"]):
+            burst = []
+            for _ in range(options["burst"]):
+                puzzle = rng.choice(puzzles)
+                sa = rng.choice(answers[puzzle.pk])
+                burst.append(
+                    {
+                        "action": "guess",
+                        "guess": sa.display_answer,
+                        "salt": sa.salt,
+                        "hash": sa.hash,
+                        "puzzle_slug": puzzle.slug,
+                    }
+                )
+            bursts.append(burst)
+        return bursts
+
+    def sync_burst(
+        self, burst: list[dict[str, Any]], options: dict[str, Any]
+    ) -> list[float]:
+        queue = list(reversed(burst))
+        samples: list[float] = []
+        lock = threading.Lock()
+
+        def worker():
+            client = Client()
+            try:
+                while True:
+                    with lock:
+                        if not queue:
+                            return
+                        data = queue.pop()
+                    start = time.perf_counter()
+                    response = client.post("/ajax", data)
+                    samples.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        raise CommandError(f"/ajax returned {response.status_code}")
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker) for _ in range(options["concurrency"])
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return samples
+
+    async def async_burst(
+        self, burst: list[dict[str, Any]], options: dict[str, Any]
+    ) -> list[float]:
+        queue = list(reversed(burst))
+        samples: list[float] = []
+
+        async def worker():
+            client = AsyncClient()
+            while queue:
+                data = queue.pop()
+                start = time.perf_counter()
+                response = await client.post("/ajax", data)
+                samples.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise CommandError(f"/ajax returned {response.status_code}")
+
+        await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+        return samples
@@ -0,0 +1,100 @@
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from io import StringIO
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from core.management.commands.bench_views import build_hunt
+from core.management.commands.loadtest import Command as LoadTest
+from core.management.commands.loadtest import Route
+from core.page_cache import page_cache
+
+PROFILES = ("before", "after")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the load test scenario against a throwaway database on disk, "
+        "with a fresh connection per request in rollback-journal mode and "
+        "then with the connection settings and SQLite pragmas from settings, "
+        "and compare requests served a second"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("--solvers", type=int, default=40)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--puzzles", type=int, default=10)
+        parser.add_argument("--wrong-guesses", type=int, default=3)
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=3,
+            help="Runs of each profile, alternating; the best is kept",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args: Any, **options: Any):
+        options["think"] = 0
+        setup_test_environment()
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == "sqlite":
+                # WAL and mmap don't apply to the in-memory test database
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                    directory, "bench.sqlite3"
+                )
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                route = Route(
+                    build_hunt("DB", chapters=5, puzzles=8, depth=2, answers=4)
+                )
+                best = dict.fromkeys(PROFILES, 0.0)
+                for _ in range(options["rounds"]):
+                    for name in PROFILES:
+                        with self.profile(name):
+                            page_cache.clear()
+                            rate = LoadTest(stdout=StringIO()).run(route, options)
+                        self.stderr.write(f"{name:>6}: {rate:.1f} req/s")
+                        best[name] = max(best[name], rate)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        self.stdout.write(
+            f"{connection.vendor}, {options['solvers']} solvers, "
+            f"{options['concurrency']} at a time: "
+            f"before {best['before']:.1f} req/s, after {best['after']:.1f} req/s "
+            f"({best['after'] / best['before']:.2f}x)"
+        )
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Before: every request opens its own connection, and SQLite keeps
+        its defaults. After: whatever settings asks for."""
+        # the wrappers of every thread share this dict
+        settings_dict = connection.settings_dict
+        conn_max_age = settings_dict["CONN_MAX_AGE"]
+        pragmas = settings.SQLITE_PRAGMAS
+        if name == "before":
+            settings_dict["CONN_MAX_AGE"] = 0
+            pragmas = {"journal_mode": "delete"}
+        connection.close()
+        try:
+            with override_settings(SQLITE_PRAGMAS=pragmas):
+                # journal_mode is set as the first connection opens
+                connection.ensure_connection()
+                yield
+        finally:
+            connection.close()
+            settings_dict["CONN_MAX_AGE"] = conn_max_age
@@ -0,0 +1,94 @@
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import Client
+
+from core.instrumentation import percentile
+from core.models import Puzzle
+from core.utils import sha
+
+# the browser tries every salt, in 101 chunks of 111
+SALTS_SEARCHED = 111 * 101
+
+
+def summarize(name: str, samples: list[float]) -> str:
+    p95 = percentile(samples, 95)
+    return (
+        f"{name:>12}: mean {statistics.mean(samples) * 1000:8.2f}ms  "
+        f"p50 {statistics.median(samples) * 1000:8.2f}ms  p95 {p95 * 1000:8.2f}ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Time grading a correct answer with the server-side check "
+        "against the salt search plus guess request the browser does otherwise"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("--puzzle", help="Slug of the puzzle to guess on")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args: Any, **options: Any):
+        puzzles = Puzzle.objects.filter(
+            unlockable__isnull=False, salted_answers__is_correct=True
+        )
+        if options["puzzle"]:
+            puzzles = puzzles.filter(slug=options["puzzle"])
+        puzzle = puzzles.select_related("unlockable__hunt").first()
+        if puzzle is None:
+            raise CommandError("No puzzle with a correct answer to guess on")
+        sa = puzzle.salted_answers.filter(is_correct=True).first()
+        assert sa is not None
+        client = Client(HTTP_HOST="127.0.0.1")
+
+        fast: list[float] = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            response = client.post(
+                "/ajax",
+                {
+                    "action": "check",
+                    "guess": sa.normalized_answer,
+                    "puzzle_slug": puzzle.slug,
+                    "volume_number": puzzle.hunt_volume_number,
+                },
+            )
+            fast.append(time.perf_counter() - start)
+            assert response.json()["correct"] == 1, response.content
+
+        hashing: list[float] = []
+        slow: list[float] = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            targets = set(puzzle.target_hashes)
+            found = [
+                (salt, digest)
+                for salt in range(SALTS_SEARCHED)
+                if (digest := sha(sa.normalized_answer + str(salt))) in targets
+            ]
+            hashed = time.perf_counter()
+            for salt, digest in found:
+                response = client.post(
+                    "/ajax",
+                    {
+                        "action": "guess",
+                        "guess": sa.normalized_answer,
+                        "salt": salt,
+                        "hash": digest,
+                        "puzzle_slug": puzzle.slug,
+                    },
+                )
+            slow.append(time.perf_counter() - start)
+            hashing.append(hashed - start)
+
+        self.stdout.write(f"Grading {puzzle.slug} ({options['repeat']} runs)")
+        self.stdout.write(summarize("check", fast))
+        self.stdout.write(summarize("salt search", hashing))
+        self.stdout.write(summarize("search+guess", slow))
+        self.stdout.write(
+            "The salt search is timed with Python's hashlib; browsers are slower, "
+            "and also yield to the event loop 100 times between chunks."
+        )
@@ -0,0 +1,76 @@
+import random
+import timeit
+from functools import partial
+from typing import Any
+
+from django.contrib.sessions.serializers import JSONSerializer
+from django.core import signing
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.progress_codec import encode_pks
+
+SALT = "django.contrib.sessions.backends.signed_cookies"
+
+
+def sign(session: dict[str, Any]) -> str:
+    # what the signed_cookies session backend puts in the cookie
+    return signing.dumps(session, compress=True, salt=SALT, serializer=JSONSerializer)
+
+
+def verify(cookie: str) -> dict[str, Any]:
+    return signing.loads(cookie, salt=SALT, serializer=JSONSerializer)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare cookie size and sign/verify time of the old list format "
+        "and the bitset format of solver progress"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[0, 10, 25, 50, 100, 250, 500, 1000],
+            help="Numbers of solved puzzles to try",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=2000, help="Iterations per timing"
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        rng = random.Random(1)
+        repeat = options["repeat"]
+        self.stdout.write(
+            f"{'solved':>6} {'format':>6} {'bytes':>6} {'sign us':>8} {'verify us':>9}"
+        )
+        for n in options["sizes"]:
+            # solved puzzles are spread across a hunt twice as big,
+            # and every solved puzzle has been opened
+            solved = sorted(rng.sample(range(1000, 1000 + 2 * n + 1), n))
+            opened = sorted(
+                set(solved) | set(rng.sample(range(1000, 1000 + 2 * n + 1), n))
+            )
+            sessions = {
+                "list": {
+                    "solved": solved,
+                    "opened": opened,
+                    "courage": 25 * n,
+                    "name": "Frisk",
+                },
+                "bitset": {
+                    "solved": {"1": encode_pks(solved)},
+                    "opened": {"1": encode_pks(opened)},
+                    "courage": 25 * n,
+                    "name": "Frisk",
+                },
+            }
+            for fmt, session in sessions.items():
+                cookie = sign(session)
+                sign_us = timeit.timeit(partial(sign, session), number=repeat)
+                verify_us = timeit.timeit(partial(verify, cookie), number=repeat)
+                self.stdout.write(
+                    f"{n:>6} {fmt:>6} {len(cookie):>6} "
+                    f"{sign_us / repeat * 1e6:>8.1f} {verify_us / repeat * 1e6:>9.1f}"
+                )
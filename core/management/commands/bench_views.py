@@ -0,0 +1,269 @@
+import json
+import platform
+import random
+import statistics
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.factories import (
+    HuntFactory,
+    PuzzleFactory,
+    RoundFactory,
+    SaltedAnswerFactory,
+    SolutionFactory,
+)
+from core.instrumentation import count_queries, percentile
+from core.models import Hunt, Puzzle, Round, SaltedAnswer, Unlockable
+from core.page_cache import page_cache
+from core.rendering import markdown_cache
+
+
+def build_hunt(
+    volume_number: str,
+    chapters: int,
+    puzzles: int,
+    depth: int,
+    answers: int,
+) -> Hunt:
+    """A visible, running hunt with `chapters` top-level rounds,
+    each nested `depth` deep, and `puzzles` puzzles in every round."""
+    now = timezone.now()
+    hunt = HuntFactory.create(
+        volume_number=volume_number,
+        start_date=now - timedelta(days=1),
+        end_date=now + timedelta(days=30),
+        visible=True,
+    )
+
+    def fill(parent: Round | None, level: int, prefix: str):
+        rnd = RoundFactory.create(
+            chapter_number=f"{volume_number}-{prefix}",
+            slug=f"{volume_number}-{prefix}".lower(),
+            unlockable__hunt=hunt,
+            unlockable__parent=parent,
+            unlockable__slug=f"round-{prefix}",
+        )
+        previous: Unlockable | None = None
+        for j in range(puzzles):
+            is_meta = j == puzzles - 1
+            puzzle = PuzzleFactory.create(
+                slug=f"{volume_number.lower()}-p-{prefix}-{j}",
+                is_meta=is_meta,
+                unlockable__hunt=hunt,
+                unlockable__parent=rnd,
+                unlockable__slug=f"p-{prefix}-{j}",
+                unlockable__sort_order=j,
+                # metas need the rest of the round
+                unlockable__unlock_needs=previous if is_meta else None,
+            )
+            previous = puzzle.unlockable
+            SolutionFactory.create(puzzle=puzzle)
+            for k in range(answers):
+                SaltedAnswerFactory.create(
+                    puzzle=puzzle,
+                    display_answer=f"answer {prefix} {j}" if k == 0 else f"near {k}",
+                    salt=k,
+                    is_correct=k == 0,
+                    is_canonical=k == 0,
+                    message="" if k == 0 else "Keep going!",
+                )
+        if level < depth:
+            fill(rnd, level + 1, f"{prefix}-{level}")
+
+    for i in range(chapters):
+        fill(None, 1, str(i))
+    return hunt
+
+
+def stats(samples: list[float], queries: list[int]) -> dict[str, Any]:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+        "max_queries": max(queries),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Build synthetic hunts in a throwaway test database, "
+        "time every public view, the ajax actions and the admin changelists, "
+        "and print a JSON report"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("--volumes", type=int, default=1)
+        parser.add_argument(
+            "--chapters", type=int, default=5, help="Top-level rounds per volume"
+        )
+        parser.add_argument("--puzzles", type=int, default=8, help="Puzzles per round")
+        parser.add_argument(
+            "--depth", type=int, default=2, help="How deep rounds are nested"
+        )
+        parser.add_argument(
+            "--answers", type=int, default=4, help="Salted answers per puzzle"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=30, help="Requests per URL name"
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Clear the in-process page and Markdown caches before each request",
+        )
+        parser.add_argument("--output", help="Write the report here, not to stdout")
+
+    def handle(self, *args: Any, **options: Any):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            report = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def run(self, options: dict[str, Any]) -> dict[str, Any]:
+        start = time.perf_counter()
+        for v in range(options["volumes"]):
+            build_hunt(
+                f"B{v}",
+                options["chapters"],
+                options["puzzles"],
+                options["depth"],
+                options["answers"],
+            )
+        build_time = time.perf_counter() - start
+
+        rng = random.Random(1)
+        hunts = list(Hunt.objects.all())
+        rounds = list(Round.objects.all())
+        puzzles = list(Puzzle.objects.select_related("unlockable__hunt"))
+        unlockables = list(Unlockable.objects.select_related("hunt"))
+        correct = {
+            sa.puzzle_id: sa for sa in SaltedAnswer.objects.filter(is_correct=True)
+        }
+
+        solver = Client()
+        staff = Client()
+        staff.force_login(
+            get_user_model().objects.create_superuser("bench", "bench@example.com")
+        )
+
+        def guess(puzzle: Puzzle) -> HttpResponse:
+            sa = correct[puzzle.pk]
+            return solver.post(
+                "/ajax",
+                {
+                    "action": "guess",
+                    "guess": sa.display_answer,
+                    "salt": sa.salt,
+                    "hash": sa.hash,
+                    "puzzle_slug": puzzle.slug,
+                },
+            )
+
+        def check(puzzle: Puzzle) -> HttpResponse:
+            return solver.post(
+                "/ajax",
+                {
+                    "action": "check",
+                    "guess": correct[puzzle.pk].display_answer,
+                    "volume_number": puzzle.hunt_volume_number,
+                    "puzzle_slug": puzzle.slug,
+                },
+            )
+
+        # solve every puzzle once so the solution pages are open
+        for puzzle in puzzles:
+            guess(puzzle)
+
+        targets: dict[str, Callable[[], HttpResponse]] = {
+            "hunt-list": lambda: solver.get("/"),
+            "round-unlockable-list": lambda: solver.get(
+                rng.choice(hunts).get_absolute_url()
+            ),
+            "unlockable-list": lambda: solver.get(
+                rng.choice(rounds).get_absolute_url()
+            ),
+            "puzzle-detail": lambda: solver.get(rng.choice(puzzles).get_absolute_url()),
+            "solution-detail": lambda: solver.get(
+                rng.choice(puzzles).get_solution_url()
+            ),
+            "unlockable-detail": lambda: solver.get(
+                rng.choice(unlockables).get_absolute_url()
+            ),
+            "ajax-guess": lambda: guess(rng.choice(puzzles)),
+            "ajax-check": lambda: check(rng.choice(puzzles)),
+        }
+        for model in ("hunt", "round", "unlockable", "puzzle", "saltedanswer"):
+            targets[f"admin-{model}"] = lambda model=model: staff.get(
+                f"/admin/core/{model}/"
+            )
+
+        results: dict[str, Any] = {}
+        for name, fetch in targets.items():
+            samples: list[float] = []
+            queries: list[int] = []
+            for _ in range(options["repeat"]):
+                if options["cold"]:
+                    page_cache.clear()
+                    markdown_cache.clear()
+                with count_queries() as metrics:
+                    start = time.perf_counter()
+                    response = fetch()
+                    samples.append(time.perf_counter() - start)
+                queries.append(metrics.queries)
+                if response.status_code != 200:
+                    self.stderr.write(f"{name}: status {response.status_code}")
+            results[name] = stats(samples, queries)
+
+        return {
+            "config": {
+                k: options[k]
+                for k in (
+                    "volumes",
+                    "chapters",
+                    "puzzles",
+                    "depth",
+                    "answers",
+                    "repeat",
+                    "cold",
+                )
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "size": {
+                "unlockables": len(unlockables),
+                "puzzles": len(puzzles),
+                "rounds": len(rounds),
+                "salted_answers": SaltedAnswer.objects.count(),
+                "build_seconds": round(build_time, 2),
+            },
+            "results": results,
+        }
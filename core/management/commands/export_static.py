@@ -0,0 +1,125 @@
+import json
+import posixpath
+import re
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.page_cache import page_cache
+from core.snapshot import get_hunt_snapshot
+from info.models import Page
+
+HREF = re.compile(r'href="(/[^"#?]*)([^"]*)"')
+
+
+def page_file(url: str) -> str:
+    """Where the page for `url` is written, relative to the export root."""
+    return posixpath.join(url.strip("/"), "index.html")
+
+
+def relative(from_url: str, to_url: str) -> str:
+    return posixpath.relpath(page_file(to_url), posixpath.dirname(page_file(from_url)))
+
+
+def rewrite_links(html: str, url: str, exported: set[str]) -> str:
+    """Make links to the other exported pages relative;
+    links to anything else are left pointing at the live site."""
+
+    def replace(match: re.Match[str]) -> str:
+        target, rest = match.group(1), match.group(2)
+        if target not in exported:
+            return match.group(0)
+        return f'href="{relative(url, target)}{rest}"'
+
+    return HREF.sub(replace, html)
+
+
+def add_script(html: str, answers: dict[str, Any] | None) -> str:
+    """Tell the scripts there is no server,
+    and give the answer checker the answers to grade against."""
+    script = "const static_export = true;"
+    if answers is not None:
+        script += " const static_answers = "
+        script += json.dumps(answers).replace("</", "<\\/") + ";"
+    return html.replace(
+        "</head>", f'<script type="text/javascript">{script}</script>\n</head>', 1
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Freeze an ended volume into static HTML, with links between the "
+        "exported pages made relative and the answer checker working offline"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("volume_number")
+        parser.add_argument(
+            "--output",
+            help="Directory to write to; defaults to archive/<volume> "
+            "in STATIC_ROOT, which sync_static uploads",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Export even if the hunt has not ended",
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        snapshot = get_hunt_snapshot(options["volume_number"])
+        hunt = snapshot.hunt
+        if not hunt.has_ended and not options["force"]:
+            raise CommandError(
+                f"Volume {hunt.volume_number} has not ended, "
+                "so its pages still depend on the solver"
+            )
+        output = Path(
+            options["output"]
+            or Path(settings.STATIC_ROOT) / "archive" / hunt.volume_number
+        )
+
+        urls = ["/", hunt.get_absolute_url()]
+        urls += [r.get_absolute_url() for r in snapshot.rounds.values()]
+        urls += [u.get_absolute_url() for u in snapshot.unlockables.values()]
+        for puzzle in snapshot.puzzles.values():
+            urls += [puzzle.get_absolute_url(), puzzle.get_solution_url()]
+        urls += [
+            p.get_absolute_url()
+            for p in Page.objects.filter(published=True, listed=True)
+        ]
+        exported = set(urls)
+
+        # answers the browser finds a salt for are graded from this table
+        static_answers = {
+            puzzle.get_absolute_url(): {
+                sa.hash: {
+                    "correct": sa.is_correct,
+                    "message": sa.message,
+                    "url": relative(
+                        puzzle.get_absolute_url(), puzzle.get_solution_url()
+                    ),
+                }
+                for sa in puzzle.salted_answers.all()
+            }
+            for puzzle in snapshot.puzzles.values()
+        }
+
+        # pages cached earlier were rendered for the live grader
+        page_cache.clear()
+        client = Client()
+        # the test client asks for the host "testserver"
+        with override_settings(ALLOWED_HOSTS=["testserver"], FAST_GRADING=False):
+            for url in urls:
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}")
+                html = rewrite_links(response.content.decode(), url, exported)
+                html = add_script(html, static_answers.get(url))
+                path = output / page_file(url)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(html, encoding="utf-8")
+        self.stdout.write(f"Wrote {len(urls)} pages to {output}")
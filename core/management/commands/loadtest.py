@@ -0,0 +1,282 @@
+import random
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import resolve
+
+from core.instrumentation import percentile
+from core.management.commands.bench_views import build_hunt
+from core.models import Hunt, Puzzle, Round, SaltedAnswer, Unlockable
+from core.progresso import check_unlocked
+
+
+class Route:
+    """What a solver needs to know about a hunt to walk through it."""
+
+    def __init__(self, hunt: Hunt):
+        self.hunt = hunt
+        self.rounds = list(
+            Round.objects.filter(unlockable__hunt=hunt)
+            .select_related("unlockable")
+            .order_by("unlockable__sort_order", "chapter_number")
+        )
+        puzzles = Puzzle.objects.filter(unlockable__hunt=hunt).select_related(
+            "unlockable"
+        )
+        self.puzzles: dict[int, list[Puzzle]] = defaultdict(list)
+        for puzzle in puzzles.order_by("unlockable__sort_order"):
+            assert puzzle.unlockable is not None
+            self.puzzles[puzzle.unlockable.parent_id or 0].append(puzzle)
+        for u in [r.unlockable for r in self.rounds] + [
+            p.unlockable for ps in self.puzzles.values() for p in ps
+        ]:
+            if u is not None:
+                u.hunt = hunt
+        self.answers: dict[int, SaltedAnswer] = {
+            sa.puzzle_id: sa
+            for sa in SaltedAnswer.objects.filter(
+                puzzle__unlockable__hunt=hunt, is_correct=True
+            )
+        }
+
+
+class Solver:
+    def __init__(self, route: Route, rng: random.Random, options: dict[str, Any]):
+        self.route = route
+        self.rng = rng
+        self.options = options
+        # a server error is counted like any other response, not raised
+        self.client = Client(raise_request_exception=False)
+        self.samples: list[tuple[str, int, float]] = []
+        self.cookie_sizes: list[int] = []
+
+    def request(self, method: str, path: str, data: Any = None) -> HttpResponse:
+        start = time.perf_counter()
+        if method == "GET":
+            response = self.client.get(path)
+        else:
+            response = self.client.post(path, data)
+        elapsed = time.perf_counter() - start
+        match = resolve(path)
+        name = match.url_name or path
+        if name == "ajax":
+            name = f"ajax-{data['action']}"
+        self.samples.append((name, response.status_code, elapsed))
+        cookie = self.client.cookies.get(settings.SESSION_COOKIE_NAME)
+        self.cookie_sizes.append(len(cookie.value) if cookie is not None else 0)
+        if think := self.options["think"]:
+            time.sleep(self.rng.uniform(0, 2 * think) / 1000)
+        return response
+
+    def is_unlocked(self, u: Unlockable | None) -> bool:
+        """Whether the solver's progress so far opens `u`, as the round
+        pages show it; a solver only follows the links they are shown."""
+        request = RequestFactory().get("/")
+        request.session = self.client.session
+        request.user = AnonymousUser()
+        return u is not None and check_unlocked(request, u)
+
+    def guess(self, puzzle: Puzzle, answer: str, sa: SaltedAnswer | None):
+        if settings.FAST_GRADING:
+            data = {
+                "action": "check",
+                "guess": answer,
+                "volume_number": self.route.hunt.volume_number,
+                "puzzle_slug": puzzle.slug,
+            }
+        else:
+            # only answers the browser finds a salt for are sent
+            if sa is None:
+                return
+            data = {
+                "action": "guess",
+                "guess": answer,
+                "salt": sa.salt,
+                "hash": sa.hash,
+                "puzzle_slug": puzzle.slug,
+            }
+        self.request("POST", "/ajax", data)
+
+    def solve(self, puzzle: Puzzle):
+        if self.request("GET", puzzle.get_absolute_url()).status_code != 200:
+            return
+        for _ in range(self.rng.randint(0, self.options["wrong_guesses"])):
+            self.guess(puzzle, f"wrong {self.rng.random()}", None)
+        sa = self.route.answers.get(puzzle.pk)
+        if sa is not None:
+            self.guess(puzzle, sa.display_answer, sa)
+            self.request("GET", puzzle.get_solution_url())
+
+    def run(self):
+        try:
+            self.request("GET", "/")
+            self.request("GET", self.route.hunt.get_absolute_url())
+            budget = self.options["puzzles"]
+            for rnd in self.route.rounds:
+                # what is still locked would only be a 403, counted as an error
+                if not self.is_unlocked(rnd.unlockable):
+                    continue
+                if self.request("GET", rnd.get_absolute_url()).status_code != 200:
+                    continue
+                # solving a puzzle can open others in the round
+                pending = list(self.route.puzzles[rnd.pk])
+                while ready := [p for p in pending if self.is_unlocked(p.unlockable)]:
+                    if budget == 0:
+                        return
+                    puzzle = self.rng.choice(ready)
+                    pending.remove(puzzle)
+                    self.solve(puzzle)
+                    budget -= 1
+        finally:
+            connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate solvers walking through a hunt concurrently, in-process, "
+        "and report throughput, latency per URL name and cookie growth"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("--solvers", type=int, default=20)
+        parser.add_argument(
+            "--concurrency", type=int, default=4, help="Solvers running at once"
+        )
+        parser.add_argument(
+            "--puzzles", type=int, default=10, help="Puzzles each solver attempts"
+        )
+        parser.add_argument("--wrong-guesses", type=int, default=3)
+        parser.add_argument(
+            "--think", type=float, default=0, help="Mean think time in ms"
+        )
+        parser.add_argument(
+            "--volume", help="Volume to solve; defaults to the first visible one"
+        )
+        parser.add_argument(
+            "--synthetic",
+            action="store_true",
+            help="Solve a synthetic hunt in a throwaway test database instead",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args: Any, **options: Any):
+        setup_test_environment()
+        old_name = None
+        try:
+            if options["synthetic"]:
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+                hunt = build_hunt("LOAD", chapters=5, puzzles=8, depth=2, answers=4)
+            else:
+                hunts = Hunt.objects.filter(visible=True).order_by("pk")
+                if options["volume"]:
+                    hunts = hunts.filter(volume_number=options["volume"])
+                if (found := hunts.first()) is None:
+                    raise CommandError("No visible hunt to solve")
+                hunt = found
+            self.run(Route(hunt), options)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def run(self, route: Route, options: dict[str, Any]) -> float:
+        """Walk the solvers through the hunt, print the report
+        and return the requests served a second."""
+        rng = random.Random(options["seed"])
+        solvers = [
+            Solver(route, random.Random(rng.random()), options)
+            for _ in range(options["solvers"])
+        ]
+        queue = list(reversed(solvers))
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    solver = queue.pop()
+                solver.run()
+
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=worker) for _ in range(options["concurrency"])
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - start
+
+        # latencies of successful responses only; errors are counted apart
+        by_name: dict[str, list[float]] = defaultdict(list)
+        statuses: dict[str, Counter[int]] = defaultdict(Counter)
+        for solver in solvers:
+            for name, status, elapsed in solver.samples:
+                statuses[name][status] += 1
+                if status < 400:
+                    by_name[name].append(elapsed * 1000)
+        total = sum(sum(c.values()) for c in statuses.values())
+
+        self.stdout.write(
+            f"{options['solvers']} solvers on {route.hunt.volume_number}, "
+            f"{options['concurrency']} at a time: "
+            f"{total} requests in {wall:.2f}s, {total / wall:.1f} req/s"
+        )
+        self.stdout.write(
+            f"{'url name':>22} {'count':>6} {'4xx':>5} {'5xx':>5} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for name, counts in sorted(statuses.items()):
+            client_errors = sum(
+                n for status, n in counts.items() if 400 <= status < 500
+            )
+            server_errors = sum(n for status, n in counts.items() if status >= 500)
+            line = (
+                f"{name:>22} {sum(counts.values()):>6} "
+                f"{client_errors:>5} {server_errors:>5}"
+            )
+            if samples := by_name.get(name):
+                line += (
+                    f" {statistics.median(samples):>8.2f} "
+                    f"{percentile(samples, 95):>8.2f} {percentile(samples, 99):>8.2f}"
+                )
+            self.stdout.write(line)
+        errors = sorted(
+            f"{status} x{n} on {name}"
+            for name, counts in statuses.items()
+            for status, n in counts.items()
+            if status >= 400
+        )
+        if errors:
+            self.stdout.write("errors: " + ", ".join(errors))
+
+        final = [s.cookie_sizes[-1] for s in solvers if s.cookie_sizes]
+        largest = [max(s.cookie_sizes) for s in solvers if s.cookie_sizes]
+        if final:
+            self.stdout.write(
+                f"session cookie: {min(final)}-{max(final)} bytes at the end, "
+                f"mean {sum(final) / len(final):.0f}, largest seen {max(largest)}"
+            )
+
+        server_errors = sum(
+            n
+            for counts in statuses.values()
+            for status, n in counts.items()
+            if status >= 500
+        )
+        if server_errors:
+            raise CommandError(f"{server_errors} requests failed with a server error")
+        return total / wall
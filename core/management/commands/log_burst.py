@@ -0,0 +1,143 @@
+import json
+import logging
+import queue
+import statistics
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import QueueHandler
+from typing import Any, ClassVar
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.logs import BatchingQueueListener
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    """Accepts webhook posts like Discord would, only slower if asked."""
+
+    posts: ClassVar[list[dict[str, Any]]] = []
+    delay = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.posts.append(json.loads(self.rfile.read(length)))
+        time.sleep(self.delay)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+
+class PostHandler(logging.Handler):
+    """Posts each record to a webhook the way the Discord handler does,
+    one HTTP request per record."""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+    def emit(self, record: logging.LogRecord):
+        body = json.dumps({"content": self.format(record)[:2000]}).encode()
+        request = urllib.request.Request(
+            self.url, body, {"Content-Type": "application/json"}
+        )
+        urllib.request.urlopen(request).close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Log a burst of errors from several threads to a stub webhook on "
+        "localhost, through the batching queue listener and directly, "
+        "and report how long the logging calls blocked and what was posted"
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("--records", type=int, default=200)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--distinct", type=int, default=5, help="Different messages in the burst"
+        )
+        parser.add_argument(
+            "--delay", type=float, default=0.05, help="Seconds the stub takes per post"
+        )
+        parser.add_argument(
+            "--interval", type=float, default=0.5, help="Seconds to collect a batch"
+        )
+        parser.add_argument(
+            "--per-minute", type=int, default=60, help="Most batches posted a minute"
+        )
+        parser.add_argument(
+            "--spread", type=float, default=0, help="Seconds to spread the burst over"
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        StubWebhook.delay = options["delay"]
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhook)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        try:
+            for mode in ("queued", "direct"):
+                StubWebhook.posts = []
+                self.burst(mode, url, options)
+        finally:
+            server.shutdown()
+
+    def burst(self, mode: str, url: str, options: dict[str, Any]):
+        logger = logging.getLogger(f"log_burst.{mode}")
+        logger.propagate = False
+        target = PostHandler(url)
+        listener = None
+        if mode == "queued":
+            listener = BatchingQueueListener(
+                queue.Queue(),
+                target,
+                interval=options["interval"],
+                per_minute=options["per_minute"],
+            )
+            logger.addHandler(QueueHandler(listener.queue))
+            listener.start()
+        else:
+            logger.addHandler(target)
+
+        blocked: list[float] = []
+        lock = threading.Lock()
+        per_thread = options["records"] // options["threads"]
+        pause = options["spread"] / per_thread
+
+        def worker(n: int):
+            for i in range(per_thread):
+                start = time.perf_counter()
+                logger.error(
+                    "Something broke in view %d", (n + i) % options["distinct"]
+                )
+                with lock:
+                    blocked.append(time.perf_counter() - start)
+                time.sleep(pause)
+
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=worker, args=(n,))
+            for n in range(options["threads"])
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - start
+        if listener is not None:
+            listener.stop()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        blocked.sort()
+        self.stdout.write(
+            f"{mode:>6}: {len(blocked)} records from {options['threads']} threads "
+            f"in {wall:.2f}s, {len(StubWebhook.posts)} posts; logging call "
+            f"p50 {statistics.median(blocked) * 1000:.3f} ms, "
+            f"max {blocked[-1] * 1000:.3f} ms"
+        )
+        for post in StubWebhook.posts[:3]:
+            self.stdout.write("    " + post["content"].replace("\n", "\n    "))
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.rendering import (
+    MARKDOWN_CONFIG_VERSION,
+    MarkdownRenderedModel,
+    convert_to_markdown,
+)
+from core.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render the stored HTML of every Markdown field. "
+        "Run this after changing the Markdown extension config."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-render every row, not just the ones rendered with an old config",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Number of worker processes (default: one per CPU)",
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        models = [
+            model
+            for model in apps.get_models()
+            if issubclass(model, MarkdownRenderedModel)
+        ]
+        rendered_any = False
+        with ProcessPoolExecutor(max_workers=options["jobs"]) as pool:
+            for model in models:
+                queryset = model.objects.all()
+                if not options["all"]:
+                    queryset = queryset.exclude(
+                        rendered_version=MARKDOWN_CONFIG_VERSION
+                    )
+                objs = list(queryset)
+                if not objs:
+                    continue
+                sources = [
+                    getattr(obj, f) for obj in objs for f in model.markdown_fields
+                ]
+                rendered = iter(pool.map(convert_to_markdown, sources, chunksize=16))
+                for obj in objs:
+                    for f in model.markdown_fields:
+                        setattr(obj, f + "_html", next(rendered))
+                    obj.rendered_version = MARKDOWN_CONFIG_VERSION
+                model.objects.bulk_update(
+                    objs,
+                    model.html_fields() + ["rendered_version"],
+                    batch_size=100,
+                )
+                rendered_any = True
+                self.stdout.write(
+                    f"Rendered {len(objs)} {model._meta.verbose_name_plural}"
+                )
+        if rendered_any:
+            # bulk_update skips the signals that normally bump this
+            bump_version()
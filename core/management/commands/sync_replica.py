@@ -0,0 +1,47 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.routers import REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        "Load fixtures into the primary database, then copy it over the local "
+        "SQLite replica, standing in for replication; with no fixtures, "
+        "only copy. Edits made since the last copy show how staff and "
+        "solvers see a lagging replica."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument("fixture_labels", nargs="*")
+
+    def handle(self, *args: Any, **options: Any):
+        if REPLICA not in settings.DATABASES:
+            raise CommandError("No replica is configured; set SQLITE_REPLICA=1")
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[REPLICA]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError(
+                "Only SQLite replicas are copied; others follow the primary "
+                "through replication"
+            )
+
+        if options["fixture_labels"]:
+            call_command(
+                "loaddata",
+                *options["fixture_labels"],
+                database=DEFAULT_DB_ALIAS,
+                verbosity=options["verbosity"],
+            )
+
+        # the backup API copies a consistent snapshot, WAL included
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+        self.stdout.write(
+            f"Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']}"
+        )
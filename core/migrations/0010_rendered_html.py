@@ -0,0 +1,130 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:35
+
+from typing import ClassVar
+
+from django.db import migrations, models
+
+from core.rendering import MARKDOWN_CONFIG_VERSION, convert_to_markdown
+
+MARKDOWN_FIELDS = {
+    "unlockable": ("intro_story_text",),
+    "puzzle": ("flavor_text", "content"),
+    "solution": ("post_solve_story", "solution_text", "author_notes"),
+    "round": ("round_text",),
+}
+
+
+def render_html(apps, schema_editor):
+    for model_name, fields in MARKDOWN_FIELDS.items():
+        model = apps.get_model("core", model_name)
+        objs = list(model.objects.all())
+        for obj in objs:
+            for f in fields:
+                setattr(obj, f + "_html", convert_to_markdown(getattr(obj, f)))
+            obj.rendered_version = MARKDOWN_CONFIG_VERSION
+        model.objects.bulk_update(
+            objs, [f + "_html" for f in fields] + ["rendered_version"], batch_size=100
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ("core", "0009_remove_testsolvesession_puzzle_remove_token_attempts_and_more"),
+    ]
+
+    operations: ClassVar[list[migrations.operations.base.Operation]] = [
+        migrations.AddField(
+            model_name="puzzle",
+            name="content_html",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Rendered HTML of content"
+            ),
+        ),
+        migrations.AddField(
+            model_name="puzzle",
+            name="flavor_text_html",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Rendered HTML of flavor_text"
+            ),
+        ),
+        migrations.AddField(
+            model_name="puzzle",
+            name="rendered_version",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Markdown config the HTML columns were rendered with",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="round",
+            name="rendered_version",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Markdown config the HTML columns were rendered with",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="round",
+            name="round_text_html",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Rendered HTML of round_text"
+            ),
+        ),
+        migrations.AddField(
+            model_name="solution",
+            name="author_notes_html",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Rendered HTML of author_notes"
+            ),
+        ),
+        migrations.AddField(
+            model_name="solution",
+            name="post_solve_story_html",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Rendered HTML of post_solve_story",
+            ),
+        ),
+        migrations.AddField(
+            model_name="solution",
+            name="rendered_version",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Markdown config the HTML columns were rendered with",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="solution",
+            name="solution_text_html",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Rendered HTML of solution_text"
+            ),
+        ),
+        migrations.AddField(
+            model_name="unlockable",
+            name="intro_story_text_html",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Rendered HTML of intro_story_text",
+            ),
+        ),
+        migrations.AddField(
+            model_name="unlockable",
+            name="rendered_version",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Markdown config the HTML columns were rendered with",
+                max_length=12,
+            ),
+        ),
+        migrations.RunPython(render_html, migrations.RunPython.noop),
+    ]
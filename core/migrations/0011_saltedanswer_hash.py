@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:47
+
+from typing import ClassVar
+
+from django.db import migrations, models
+
+from core.utils import normalize, sha
+
+
+def compute_hashes(apps, schema_editor):
+    SaltedAnswer = apps.get_model("core", "SaltedAnswer")
+    answers = list(SaltedAnswer.objects.all())
+    for sa in answers:
+        sa.normalized_answer = normalize(sa.display_answer)
+        sa.hash = sha(sa.normalized_answer + str(sa.salt))
+    SaltedAnswer.objects.bulk_update(
+        answers, ["normalized_answer", "hash"], batch_size=100
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ("core", "0010_rendered_html"),
+    ]
+
+    operations: ClassVar[list[migrations.operations.base.Operation]] = [
+        migrations.AddField(
+            model_name="saltedanswer",
+            name="hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="The salted hash solvers' browsers compare against; set on save",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="saltedanswer",
+            name="normalized_answer",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="The display answer, normalized; set on save",
+                max_length=255,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="saltedanswer",
+            index=models.Index(
+                fields=["puzzle", "hash"], name="core_salted_puzzle__f4c0ed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="saltedanswer",
+            index=models.Index(
+                fields=["puzzle", "normalized_answer"],
+                name="core_salted_puzzle__1ada04_idx",
+            ),
+        ),
+        migrations.RunPython(compute_hashes, migrations.RunPython.noop),
+    ]
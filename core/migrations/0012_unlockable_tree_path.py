@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from typing import ClassVar
+
+from django.db import migrations, models
+
+from core.utils import tree_paths
+
+
+def compute_tree_paths(apps, schema_editor):
+    Unlockable = apps.get_model("core", "Unlockable")
+    Round = apps.get_model("core", "Round")
+    paths = tree_paths(
+        dict(Unlockable.objects.values_list("pk", "parent_id")),
+        dict(Round.objects.values_list("pk", "unlockable_id")),
+    )
+    unlockables = [
+        Unlockable(pk=pk, tree_path=path, depth=path.count("/"))
+        for pk, path in paths.items()
+    ]
+    Unlockable.objects.bulk_update(unlockables, ["tree_path", "depth"], batch_size=100)
+
+
+class Migration(migrations.Migration):
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ("core", "0011_saltedanswer_hash"),
+    ]
+
+    operations: ClassVar[list[migrations.operations.base.Operation]] = [
+        migrations.AddField(
+            model_name="unlockable",
+            name="depth",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of rounds above this; set on save",
+            ),
+        ),
+        migrations.AddField(
+            model_name="unlockable",
+            name="tree_path",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Pks of the rounds above this, top first, each followed by /; set on save",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(compute_tree_paths, migrations.RunPython.noop),
+    ]
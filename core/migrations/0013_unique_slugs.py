@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:09
+
+from typing import ClassVar
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_puzzle_slugs(apps, schema_editor):
+    # fail with the offending slugs rather than an IntegrityError
+    Puzzle = apps.get_model("core", "Puzzle")
+    duplicates = Puzzle.objects.values("slug").annotate(n=Count("pk")).filter(n__gt=1)
+    if slugs := [row["slug"] for row in duplicates]:
+        raise RuntimeError(
+            "Rename the duplicate puzzle slugs first: " + ", ".join(slugs)
+        )
+
+
+def check_unlockable_slugs(apps, schema_editor):
+    Unlockable = apps.get_model("core", "Unlockable")
+    duplicates = (
+        Unlockable.objects.values("hunt__volume_number", "slug")
+        .annotate(n=Count("pk"))
+        .filter(n__gt=1)
+    )
+    if slugs := [f"{row['hunt__volume_number']}/{row['slug']}" for row in duplicates]:
+        raise RuntimeError(
+            "Rename the duplicate unlockable slugs first: " + ", ".join(slugs)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ("core", "0012_unlockable_tree_path"),
+    ]
+
+    operations: ClassVar[list[migrations.operations.base.Operation]] = [
+        migrations.RunPython(check_puzzle_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="puzzle",
+            name="slug",
+            field=models.SlugField(help_text="The slug for the puzzle", unique=True),
+        ),
+        migrations.RunPython(check_unlockable_slugs, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="unlockable",
+            unique_together={("hunt", "slug")},
+        ),
+    ]
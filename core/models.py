@@ -1,4 +1,5 @@
 import random
+from typing import ClassVar
 
 from django.db import models
 from django.db.models.query import QuerySet
@@ -6,6 +7,7 @@ from django.urls import reverse
 from django.utils import timezone
 from markdownx.models import MarkdownxField
 
+from .rendering import MarkdownRenderedModel
 from .utils import normalize, sha
 
 
@@ -51,7 +53,9 @@ class Hunt(models.Model):
         return self.has_started and not self.has_ended
 
 
-class Unlockable(models.Model):
+class Unlockable(MarkdownRenderedModel):
+    markdown_fields = ("intro_story_text",)
+
     hunt = models.ForeignKey(
         Hunt,
         help_text="The hunt this unlockable belongs to",
@@ -88,6 +92,9 @@ class Unlockable(models.Model):
     intro_story_text = MarkdownxField(
         help_text="Markdown for the pre-entry story", blank=True
     )
+    intro_story_text_html = models.TextField(
+        help_text="Rendered HTML of intro_story_text", blank=True, editable=False
+    )
 
     unlock_courage_threshold = models.IntegerField(
         default=0,
@@ -128,6 +135,19 @@ class Unlockable(models.Model):
         related_name="redirected_by",
     )
 
+    tree_path = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Pks of the rounds above this, top first, each followed by /; "
+        "set on save",
+    )
+    depth = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of rounds above this; set on save",
+    )
+
     @property
     def is_puzzle(self) -> bool:
         return hasattr(self, "puzzle")
@@ -146,6 +166,10 @@ class Unlockable(models.Model):
         s += f" ▶️▶️  (+{self.courage_bounty})"
         return s
 
+    @property
+    def ancestor_ids(self) -> list[int]:
+        return [int(pk) for pk in self.tree_path.split("/") if pk]
+
     @property
     def _parent(self):
         if self.is_round:
@@ -182,9 +206,21 @@ class Unlockable(models.Model):
             "sort_order",
             "name",
         )
+        unique_together = (
+            "hunt",
+            "slug",
+        )
+
 
+class Puzzle(MarkdownRenderedModel):
+    """A puzzle, placed in a hunt by its unlockable.
+
+    Slugs are unique across every volume, not only within one, as for
+    rounds: the guess endpoint and the catalog find a puzzle by its slug
+    alone, so a slug can't be reused in a later volume."""
+
+    markdown_fields = ("flavor_text", "content")
 
-class Puzzle(models.Model):
     unlockable = models.OneToOneField(
         Unlockable,
         help_text="Associated unlockable for this puzzle",
@@ -193,17 +229,23 @@ class Puzzle(models.Model):
         on_delete=models.SET_NULL,
     )
     name = models.CharField(max_length=80)
-    slug = models.SlugField(help_text="The slug for the puzzle")
+    slug = models.SlugField(help_text="The slug for the puzzle", unique=True)
     is_meta = models.BooleanField(help_text="Is this a metapuzzle?", default=False)
 
     flavor_text = MarkdownxField(
         help_text="Markdown for puzzle flavor text",
         blank=True,
     )
+    flavor_text_html = models.TextField(
+        help_text="Rendered HTML of flavor_text", blank=True, editable=False
+    )
     content = MarkdownxField(
         help_text="Markdown for the puzzle content",
         blank=True,
     )
+    content_html = models.TextField(
+        help_text="Rendered HTML of content", blank=True, editable=False
+    )
     puzzle_head = models.TextField(
         help_text="Extra HTML code for dynamic puzzles. "
         "Leave this blank for a standard 'static' puzzle.",
@@ -230,10 +272,9 @@ class Puzzle(models.Model):
     def get_parent_url(self) -> str:
         if self.unlockable is None:
             return "/"
-        elif self.unlockable.parent is None:
-            return self.unlockable.hunt.get_absolute_url()
-        else:
-            return self.unlockable.parent.get_absolute_url()
+        from .snapshot import get_hunt_snapshot  # imports this module
+
+        return get_hunt_snapshot(self.hunt_volume_number).parent_url(self.unlockable)
 
     def __str__(self) -> str:
         return self.name
@@ -244,10 +285,16 @@ class Puzzle(models.Model):
 
     @property
     def answer(self) -> str:
-        return self.salted_answers.get(is_canonical=True).display_answer
+        # iterate rather than .get() so prefetched answers are reused
+        for sa in self.salted_answers.all():
+            if sa.is_canonical:
+                return sa.display_answer
+        raise SaltedAnswer.DoesNotExist(f"No canonical answer for {self.slug}")
+
 
+class Solution(MarkdownRenderedModel):
+    markdown_fields = ("post_solve_story", "solution_text", "author_notes")
 
-class Solution(models.Model):
     puzzle = models.OneToOneField(
         Puzzle, help_text="The puzzle this is a solution for", on_delete=models.CASCADE
     )
@@ -255,14 +302,23 @@ class Solution(models.Model):
         help_text="Markdown for the post-solve story",
         blank=True,
     )
+    post_solve_story_html = models.TextField(
+        help_text="Rendered HTML of post_solve_story", blank=True, editable=False
+    )
     solution_text = MarkdownxField(
         help_text="Markdown for the puzzle solution",
         blank=True,
     )
+    solution_text_html = models.TextField(
+        help_text="Rendered HTML of solution_text", blank=True, editable=False
+    )
     author_notes = MarkdownxField(
         help_text="Markdown for the author's notes",
         blank=True,
     )
+    author_notes_html = models.TextField(
+        help_text="Rendered HTML of author_notes", blank=True, editable=False
+    )
     post_solve_image_path = models.CharField(
         max_length=240, help_text="Static path to the post-solve image", blank=True
     )
@@ -314,13 +370,22 @@ class SaltedAnswer(models.Model):
         default=True,
     )
 
-    @property
-    def hash(self) -> str:
-        return sha(self.normalized_answer + str(self.salt))
+    normalized_answer = models.CharField(
+        max_length=255,
+        help_text="The display answer, normalized; set on save",
+        blank=True,
+        editable=False,
+    )
+    hash = models.CharField(
+        max_length=64,
+        help_text="The salted hash solvers' browsers compare against; set on save",
+        blank=True,
+        editable=False,
+    )
 
-    @property
-    def normalized_answer(self) -> str:
-        return normalize(self.display_answer)
+    def compute_hash(self):
+        self.normalized_answer = normalize(self.display_answer)
+        self.hash = sha(self.normalized_answer + str(self.salt))
 
     def equals(self, other: str):
         return self.normalized_answer == normalize(other)
@@ -330,12 +395,18 @@ class SaltedAnswer(models.Model):
             "puzzle",
             "salt",
         )
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["puzzle", "hash"]),
+            models.Index(fields=["puzzle", "normalized_answer"]),
+        ]
 
     def __str__(self) -> str:
         return self.display_answer
 
 
-class Round(models.Model):
+class Round(MarkdownRenderedModel):
+    markdown_fields = ("round_text",)
+
     unlockable = models.OneToOneField(
         Unlockable,
         help_text="Associated unlockable for this round",
@@ -357,6 +428,9 @@ class Round(models.Model):
     round_text = MarkdownxField(
         help_text="Markdown for content in the round page", blank=True
     )
+    round_text_html = models.TextField(
+        help_text="Rendered HTML of round_text", blank=True, editable=False
+    )
 
     def get_absolute_url(self):
         return reverse("unlockable-list", args=(self.chapter_number,))
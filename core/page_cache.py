@@ -0,0 +1,117 @@
+"""Rendered pages shared between solvers with the same progress.
+
+Early in a hunt most solvers in a chapter have solved and opened the same
+things, so they are shown byte-identical pages. Only the template render
+is cached: the views still run, so permission checks, courage updates and
+marking pages as opened happen on every request."""
+
+import threading
+from collections import OrderedDict
+from functools import partial
+from hashlib import sha256
+from typing import Any
+
+from django.conf import settings
+from django.contrib import messages
+from django.http import HttpRequest, HttpResponse
+from django.template.response import TemplateResponse
+from django.utils import timezone
+
+from .models import Hunt
+from .progresso import get_progress_fingerprint
+from .snapshot import get_catalog
+from .utils import is_staff
+
+
+class PageCache:
+    """Bounded in-process LRU of rendered pages, limited by total size."""
+
+    def __init__(self, maxbytes: int):
+        self.maxbytes = maxbytes
+        self.lock = threading.Lock()
+        self.lru: OrderedDict[str, bytes] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self.lock:
+            content = self.lru.get(key)
+            if content is None:
+                self.misses += 1
+            else:
+                self.lru.move_to_end(key)
+                self.hits += 1
+            return content
+
+    def set(self, key: str, content: bytes):
+        if len(content) > self.maxbytes:
+            return
+        with self.lock:
+            if (old := self.lru.pop(key, None)) is not None:
+                self.size -= len(old)
+            self.lru[key] = content
+            self.size += len(content)
+            while self.size > self.maxbytes:
+                _, evicted = self.lru.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.lru),
+                "bytes": self.size,
+                "maxbytes": self.maxbytes,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.lru.clear()
+            self.size = self.hits = self.misses = 0
+
+
+page_cache = PageCache(maxbytes=getattr(settings, "PAGE_CACHE_BYTES", 32 * 1024**2))
+
+
+def page_cache_key(request: HttpRequest, hunt: Hunt | None) -> str | None:
+    """None if the page must not be shared, e.g. it is shown to staff
+    or has messages to show."""
+    if is_staff(request.user) or len(messages.get_messages(request)):
+        return None
+    catalog = get_catalog()
+    return sha256(
+        "|".join(
+            [
+                request.get_full_path(),
+                str(catalog.version),
+                str(catalog.epoch(timezone.now())),
+                get_progress_fingerprint(request, hunt),
+            ]
+        ).encode("UTF-8")
+    ).hexdigest()
+
+
+def _store(key: str, response: TemplateResponse):
+    if response.status_code == 200:
+        page_cache.set(key, response.content)
+
+
+class PageCacheMixin:
+    """For template views whose page only depends on the progress in one
+    hunt, given by `get_page_hunt`."""
+
+    request: HttpRequest
+
+    def get_page_hunt(self) -> Hunt | None:
+        return getattr(self, "hunt", None)
+
+    def render_to_response(self, context: dict[str, Any], **response_kwargs: Any):
+        key = page_cache_key(self.request, self.get_page_hunt())
+        if key is not None and (content := page_cache.get(key)) is not None:
+            return HttpResponse(content)
+        response = super().render_to_response(context, **response_kwargs)  # type: ignore
+        if key is not None:
+            response.add_post_render_callback(partial(_store, key))
+        return response
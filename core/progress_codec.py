@@ -0,0 +1,50 @@
+"""Compact encoding of sets of unlockable pks for the signed-cookie session.
+
+A set of pks is stored as ``"<version>.<base>.<bits>"``, where ``base``
+is the smallest pk and ``bits`` is a base64 bitset whose i-th bit says
+whether ``base + i`` is in the set. The unlockables of a hunt are created
+together, so their pks are nearly contiguous and the bitset stays dense.
+
+Offsetting by pk rather than numbering the hunt's unlockables densely
+keeps stored progress meaning the same thing when an unlockable is
+deleted; dense numbers would shift and hand solves to the wrong puzzles.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Iterable
+
+VERSION = 1
+
+
+def encode_pks(pks: Iterable[int]) -> str:
+    pks = set(pks)
+    if not pks:
+        return ""
+    base = min(pks)
+    bits = 0
+    for pk in pks:
+        bits |= 1 << (pk - base)
+    packed = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return f"{VERSION}.{base}.{urlsafe_b64encode(packed).rstrip(b'=').decode()}"
+
+
+def decode_pks(s: str) -> set[int]:
+    """Decode the output of `encode_pks`.
+    Anything malformed or from an unknown version decodes to the empty set."""
+    try:
+        version, base_str, data = s.split(".")
+        if int(version) != VERSION:
+            return set()
+        base = int(base_str)
+        packed = urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    except ValueError:
+        return set()
+    bits = int.from_bytes(packed, "little")
+    pks: set[int] = set()
+    i = 0
+    while bits:
+        if bits & 1:
+            pks.add(base + i)
+        bits >>= 1
+        i += 1
+    return pks
@@ -1,54 +1,140 @@
-from django.db.models.aggregates import Sum
+from collections.abc import Iterable
+from datetime import datetime
+from hashlib import sha256
+from typing import NamedTuple
+
 from django.http import HttpRequest
 from django.utils import timezone
 
-from .models import Unlockable
+from .instrumentation import warming_up
+from .models import Hunt, Unlockable
+from .progress_codec import decode_pks, encode_pks
+from .snapshot import get_hunt_snapshot
+from .unlock_graph import UnlockGraph
 from .utils import is_staff
+from .versions import get_version
+
+
+def _load_progress(request: HttpRequest, key: str) -> dict[int, set[int]]:
+    """The solver's progress under `key`, as hunt pk -> unlockable pks.
+    Decoded from the session once per request."""
+    attr = "_progress_" + key
+    if (cached := getattr(request, attr, None)) is not None:
+        return cached
+
+    stored = request.session.get(key)
+    progress: dict[int, set[int]] = {}
+    if isinstance(stored, dict):
+        for hunt_pk, encoded in stored.items():
+            if hunt_pk.isdigit() and isinstance(encoded, str):
+                progress[int(hunt_pk)] = decode_pks(encoded)
+    elif isinstance(stored, list):
+        # old format, a flat list of unlockable pks
+        for pk, hunt_pk in Unlockable.objects.filter(pk__in=stored).values_list(
+            "pk", "hunt_id"
+        ):
+            progress.setdefault(hunt_pk, set()).add(pk)
+        _save_progress(request, key, progress)
+    setattr(request, attr, progress)
+    return progress
+
+
+def _save_progress(request: HttpRequest, key: str, progress: dict[int, set[int]]):
+    request.session[key] = {
+        str(hunt_pk): encode_pks(pks) for hunt_pk, pks in progress.items() if pks
+    }
+
+
+def _mark(request: HttpRequest, key: str, u: Unlockable):
+    progress = _load_progress(request, key)
+    pks = progress.setdefault(u.hunt_id, set())
+    if u.pk not in pks:
+        pks.add(u.pk)
+        _save_progress(request, key, progress)
+
+
+def _has(request: HttpRequest, key: str, u: Unlockable) -> bool:
+    return u.pk in _load_progress(request, key).get(u.hunt_id, ())
+
+
+def _all_pks(request: HttpRequest, key: str) -> set[int]:
+    return set().union(*_load_progress(request, key).values())
 
 
 def mark_solved(request: HttpRequest, u: Unlockable):
-    if not isinstance(request.session.get("solved", None), list):
-        request.session["solved"] = []
-    if u.pk not in request.session["solved"]:
-        request.session["solved"] += [u.pk]
+    _mark(request, "solved", u)
 
 
-def get_solved_pks(request: HttpRequest) -> list[int]:
-    if not isinstance(request.session.get("solved", None), list):
-        request.session["solved"] = []
-    return request.session["solved"]
+def get_solved_pks(request: HttpRequest) -> set[int]:
+    return _all_pks(request, "solved")
 
 
 def has_solved(request: HttpRequest, u: Unlockable) -> bool:
-    return u.pk in get_solved_pks(request)
+    return _has(request, "solved", u)
 
 
 def mark_opened(request: HttpRequest, u: Unlockable):
-    if not isinstance(request.session.get("opened", None), list):
-        request.session["opened"] = []
-    if u.pk not in request.session["opened"]:
-        request.session["opened"] += [u.pk]
+    _mark(request, "opened", u)
 
 
-def get_opened_pks(request: HttpRequest) -> list[int]:
-    if not isinstance(request.session.get("opened", None), list):
-        request.session["opened"] = []
-    return request.session["opened"]
+def get_opened_pks(request: HttpRequest) -> set[int]:
+    return _all_pks(request, "opened")
 
 
 def has_opened(request: HttpRequest, u: Unlockable) -> bool:
-    return u.pk in get_opened_pks(request)
+    return _has(request, "opened", u)
+
+
+def get_progress_fingerprint(request: HttpRequest, hunt: Hunt | None) -> str:
+    """Short digest of the progress that pages of `hunt` can show:
+    what was solved and opened in that hunt, courage and the solver's name."""
+    parts = [str(request.session.get("courage")), str(request.session.get("name"))]
+    if hunt is not None:
+        for key in ("solved", "opened"):
+            parts.append(encode_pks(_load_progress(request, key).get(hunt.pk, ())))
+    return sha256("|".join(parts).encode("UTF-8")).hexdigest()[:16]
+
+
+class HuntBounties(NamedTuple):
+    start_date: datetime
+    end_date: datetime
+    bounties: dict[int, int]
+
+
+_bounties: tuple[int, dict[int, HuntBounties]] | None = None
+
+
+def get_bounties() -> dict[int, HuntBounties]:
+    """Courage bounty of every unlockable, grouped by hunt pk.
+    Kept in memory until the content version changes."""
+    global _bounties
+    version = get_version()
+    if _bounties is None or _bounties[0] != version:
+        with warming_up():
+            hunts = {
+                pk: HuntBounties(start_date, end_date, {})
+                for pk, start_date, end_date in Hunt.objects.values_list(
+                    "pk", "start_date", "end_date"
+                )
+            }
+            for pk, hunt_pk, bounty in Unlockable.objects.values_list(
+                "pk", "hunt_id", "courage_bounty"
+            ):
+                hunts[hunt_pk].bounties[pk] = bounty
+        _bounties = (version, hunts)
+    return _bounties[1]
 
 
 def set_courage(request: HttpRequest):
-    request.session["courage"] = (
-        Unlockable.objects.filter(
-            hunt__start_date__lt=timezone.now(),
-            hunt__end_date__gt=timezone.now(),
-            pk__in=get_solved_pks(request),
-        ).aggregate(courage=Sum("courage_bounty"))["courage"]
-        or 0
-    )
+    now = timezone.now()
+    courage = 0
+    for hunt_pk, pks in _load_progress(request, "solved").items():
+        hunt = get_bounties().get(hunt_pk)
+        if hunt is not None and hunt.start_date < now < hunt.end_date:
+            courage += sum(hunt.bounties.get(pk, 0) for pk in pks)
+    # only touch the session (and so the cookie) if something changed
+    if request.session.get("courage") != courage:
+        request.session["courage"] = courage
 
 
 def get_courage(request: HttpRequest) -> int:
@@ -57,35 +143,83 @@ def get_courage(request: HttpRequest) -> int:
     return request.session["courage"] or 0
 
 
+def get_unlock_graph(hunt: Hunt) -> UnlockGraph:
+    return get_hunt_snapshot(hunt.volume_number).graph
+
+
 def check_unlocked(request: HttpRequest, u: Unlockable) -> bool:
-    if not u.hunt.visible and not is_staff(request.user):
-        return False
-    elif u.hunt.has_ended:
-        return True
-    elif not u.hunt.has_started and not is_staff(request.user):
-        return False
-    elif u.force_visibility is True:
-        return True
+    return get_unlock_graph(u.hunt).is_unlocked(
+        u,
+        is_staff(request.user),
+        get_courage(request),
+        get_solved_pks(request),
+        timezone.now(),
+    )
 
+
+def get_row_class(u: Unlockable, unlocked: bool, opened: bool, solved: bool) -> str:
+    if opened:
+        if u.is_puzzle:
+            if solved:
+                s = "bg-blue-50"
+            else:
+                s = "Bg-yellow-100"
+        elif u.story_only:
+            s = "bg-gray-100"
+        else:
+            s = ""
+    elif unlocked:
+        s = "bg-green-200"
+    elif u.story_only:
+        s = "Bg-gray-200 opacity-50"
+    else:
+        s = "opacity-50"
+
+    if (puzzle := getattr(u, "puzzle", None)) is not None and puzzle.is_meta:
+        s += " font-bold"
+    return s
+
+
+class UnlockState(NamedTuple):
+    unlocked: bool
+    opened: bool
+    solved: bool
+    row_class: str
+
+
+def get_unlock_states(
+    request: HttpRequest, hunt: Hunt, unlockables: Iterable[Unlockable]
+) -> dict[int, UnlockState]:
+    """Works out the state of every unlockable of a hunt in one pass,
+    reading the solver's progress only once."""
+    staff = is_staff(request.user)
     courage = get_courage(request)
     solved_pks = get_solved_pks(request)
+    opened_pks = get_opened_pks(request)
+    now = timezone.now()
+    graph = get_unlock_graph(hunt)
 
-    if courage < u.unlock_courage_threshold:
-        return False
-    if u.unlock_date is not None and timezone.now() < u.unlock_date:
-        return False
-    if (needed := u.unlock_needs) is not None and needed.pk not in solved_pks:
-        return False
+    states: dict[int, UnlockState] = {}
+    for u in unlockables:
+        unlocked = graph.is_unlocked(u, staff, courage, solved_pks, now)
+        opened = u.pk in opened_pks
+        solved = u.pk in solved_pks
+        states[u.pk] = UnlockState(
+            unlocked=unlocked,
+            opened=opened,
+            solved=solved,
+            row_class=get_row_class(u, unlocked, opened, solved),
+        )
+    return states
 
-    return True
+
+def get_parent_url(u: Unlockable) -> str:
+    return get_hunt_snapshot(u.hunt.volume_number).parent_url(u)
 
 
 def get_finished_url(request: HttpRequest, u: Unlockable) -> str:
     if u.on_solve_link_to is None:
-        if u.parent is None:
-            return u.hunt.get_absolute_url()
-        else:
-            return u.parent.get_absolute_url()
+        return get_parent_url(u)
     elif u.on_solve_link_to.unlockable is None:
         return u.hunt.get_absolute_url()  # wtf
     elif has_opened(request, u.on_solve_link_to.unlockable):
@@ -0,0 +1,185 @@
+import json
+import threading
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Any
+
+import markdown
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models.signals import pre_save
+
+from .instrumentation import timed
+
+MARKDOWN_EXTENSIONS = (
+    "extra",
+    "sane_lists",
+    "smarty",
+    "codehilite",
+)
+MARKDOWN_EXTENSION_CONFIGS = {
+    "codehilite": {
+        "linenums": False,
+    }
+}
+
+# Changes whenever the extension config above changes,
+# so that HTML rendered under an old config is never served.
+MARKDOWN_CONFIG_VERSION = sha256(
+    json.dumps(
+        [MARKDOWN_EXTENSIONS, MARKDOWN_EXTENSION_CONFIGS, markdown.__version__],
+        sort_keys=True,
+    ).encode("UTF-8")
+).hexdigest()[:12]
+
+
+def convert_to_markdown(s: str) -> str:
+    return markdown.markdown(
+        s,
+        extensions=MARKDOWN_EXTENSIONS,
+        extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+    )
+
+
+class MarkdownCache:
+    """Rendered HTML keyed by a hash of the Markdown source.
+
+    Lookups go to a bounded in-process LRU first,
+    then to Django's cache framework (shared between workers),
+    and only render from scratch if both miss. The key covers the source
+    and the Markdown config, so an entry is never stale."""
+
+    def __init__(self, maxsize: int, timeout: int | None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.lru: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, s: str) -> str:
+        digest = sha256(s.encode("UTF-8")).hexdigest()
+        return f"mkd:{MARKDOWN_CONFIG_VERSION}:{digest}"
+
+    def render(self, s: str) -> str:
+        key = self.key(s)
+        with self.lock:
+            html = self.lru.get(key)
+            if html is not None:
+                self.lru.move_to_end(key)
+                self.hits += 1
+                return html
+
+        html = cache.get(key)
+        if html is not None:
+            with self.lock:
+                self.shared_hits += 1
+        else:
+            with timed("mkd_time"):
+                html = convert_to_markdown(s)
+            cache.set(key, html, self.timeout)
+            with self.lock:
+                self.misses += 1
+
+        with self.lock:
+            self.lru[key] = html
+            self.lru.move_to_end(key)
+            while len(self.lru) > self.maxsize:
+                self.lru.popitem(last=False)
+                self.evictions += 1
+        return html
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.lru),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.lru.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+
+markdown_cache = MarkdownCache(
+    maxsize=getattr(settings, "MKD_CACHE_SIZE", 1024),
+    timeout=getattr(settings, "MKD_CACHE_TIMEOUT", None),
+)
+
+
+def render_markdown(s: str) -> str:
+    """Render Markdown to HTML, reusing earlier renders of the same text."""
+    if not s:
+        return ""
+    return markdown_cache.render(s)
+
+
+class MarkdownRenderedModel(models.Model):
+    """A model storing the rendered HTML of each Markdown field,
+    so that the request path never has to run Markdown.
+
+    Each field ``foo`` listed in ``markdown_fields``
+    should have a companion ``foo_html`` text field."""
+
+    markdown_fields: tuple[str, ...] = ()
+
+    rendered_version = models.CharField(
+        max_length=12,
+        help_text="Markdown config the HTML columns were rendered with",
+        blank=True,
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def html_fields(cls) -> list[str]:
+        return [f + "_html" for f in cls.markdown_fields]
+
+    def render_markdown_fields(self):
+        for f in self.markdown_fields:
+            setattr(self, f + "_html", render_markdown(getattr(self, f)))
+        self.rendered_version = MARKDOWN_CONFIG_VERSION
+
+    def save(self, *args: Any, **kwargs: Any):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(self.markdown_fields):
+            kwargs["update_fields"] = set(update_fields) | {
+                *self.html_fields(),
+                "rendered_version",
+            }
+        super().save(*args, **kwargs)
+
+
+def render_on_save(
+    sender: type[MarkdownRenderedModel],
+    instance: MarkdownRenderedModel,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+):
+    # also catches loaddata, which skips save(); saves touching only
+    # other columns leave the HTML as it is
+    if update_fields is not None and not update_fields & set(sender.markdown_fields):
+        return
+    instance.render_markdown_fields()
+
+
+def connect_render_on_save():
+    """Called once the app registry is ready, for every model with HTML columns."""
+    for model in apps.get_models():
+        if issubclass(model, MarkdownRenderedModel):
+            pre_save.connect(
+                render_on_save,
+                sender=model,
+                dispatch_uid=f"render_markdown_on_save_{model._meta.label_lower}",
+            )
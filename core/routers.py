@@ -0,0 +1,95 @@
+"""Solver-facing reads from a read replica.
+
+Solvers never write: their progress lives in the session cookie. So the
+reads their requests make of puzzle content can go to the ``replica``
+database, when one is configured, while everything else stays on the
+primary: writes, every request from staff (who should see their own
+edits at once, however far the replica lags), anything but GET and HEAD,
+and work outside a request. Reads filling the shared in-memory caches
+go to the primary too, since a stale copy built from a lagging replica
+would be kept until the next content change."""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+REPLICA = "replica"
+REPLICATED_APPS = ("core", "info")
+
+_reads: ContextVar[str] = ContextVar("reads", default=DEFAULT_DB_ALIAS)
+
+
+@contextmanager
+def primary() -> Iterator[None]:
+    """Read from the primary inside the block."""
+    token = _reads.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        if model._meta.app_label in REPLICATED_APPS:
+            return _reads.get()
+        return None
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        # not None, or Django would save an instance where it was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        return True  # the same rows either way
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        # the replica gets its schema from the primary
+        return False if db == REPLICA else None
+
+
+class ReplicaMiddleware:
+    """Sends the reads of solver requests to the replica.
+    Goes after the authentication middleware."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "READ_REPLICA", REPLICA in settings.DATABASES)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.solver_read(request) or getattr(request.user, "is_staff", False):
+            return self.get_response(request)
+        token = _reads.set(REPLICA)
+        try:
+            return self.get_response(request)
+        finally:
+            _reads.reset(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # request.user, not auser(), so the sync views find the user cached
+        if (
+            not self.solver_read(request)
+            or await sync_to_async(lambda: getattr(request.user, "is_staff", False))()
+        ):
+            return await self.get_response(request)
+        token = _reads.set(REPLICA)
+        try:
+            return await self.get_response(request)
+        finally:
+            _reads.reset(token)
+
+    def solver_read(self, request: HttpRequest) -> bool:
+        return self.enabled and request.method in ("GET", "HEAD")
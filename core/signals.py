@@ -0,0 +1,118 @@
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Round, SaltedAnswer, Unlockable
+from .utils import tree_paths
+from .versions import bump_version
+
+CONTENT_APPS = ("core", "info")
+
+
+@receiver(post_save, dispatch_uid="bump_content_version_on_save")
+@receiver(post_delete, dispatch_uid="bump_content_version_on_delete")
+def bump_content_version(sender: type[Model], **kwargs: Any):
+    if sender._meta.app_label in CONTENT_APPS:
+        bump_version()
+
+
+@receiver(pre_save, sender=SaltedAnswer, dispatch_uid="salted_answer_hash")
+def compute_salted_answer_hash(
+    sender: type[SaltedAnswer], instance: SaltedAnswer, **kwargs: Any
+):
+    # a signal rather than save() so loaddata fills these in too
+    instance.compute_hash()
+
+
+def refresh_tree_paths(hunt_ids: set[int] | None) -> dict[int, str]:
+    """Recompute tree_path and depth for the unlockables of `hunt_ids`,
+    or of every hunt for None; returns the paths."""
+    unlockables = Unlockable.objects.all()
+    rounds = Round.objects.filter(unlockable__isnull=False)
+    if hunt_ids is not None:
+        unlockables = unlockables.filter(hunt_id__in=hunt_ids)
+        rounds = rounds.filter(unlockable__hunt_id__in=hunt_ids)
+    rows = unlockables.values_list("pk", "parent_id", "tree_path")
+    paths = tree_paths(
+        {pk: parent for pk, parent, _ in rows},
+        dict(rounds.values_list("pk", "unlockable_id")),
+    )
+    stale = [
+        Unlockable(pk=pk, tree_path=paths[pk], depth=paths[pk].count("/"))
+        for pk, _, path in rows
+        if paths[pk] != path
+    ]
+    Unlockable.objects.bulk_update(stale, ["tree_path", "depth"], batch_size=100)
+    return paths
+
+
+def round_hunt_ids(*unlockable_ids: int | None) -> set[int] | None:
+    """The hunts of the unlockables a round hangs or hung from,
+    which are those of everything inside it."""
+    ids = [pk for pk in unlockable_ids if pk is not None]
+    if not ids:
+        return None  # a detached round; what is inside could be anywhere
+    return set(Unlockable.objects.filter(pk__in=ids).values_list("hunt_id", flat=True))
+
+
+@receiver(pre_save, sender=Unlockable, dispatch_uid="tree_path_unlockable_move")
+@receiver(pre_save, sender=Round, dispatch_uid="tree_path_round_move")
+def note_tree_move(
+    sender: type[Model],
+    instance: Model,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+):
+    # only a new parent round, or a round hung from another unlockable,
+    # moves anything in the tree
+    field = "parent_id" if sender is Unlockable else "unlockable_id"
+    instance._tree_moved = False  # type: ignore
+    if update_fields is not None and update_fields.isdisjoint(
+        {field, field.removesuffix("_id")}
+    ):
+        return
+    before = None
+    if instance.pk is not None:
+        found = sender._default_manager.filter(pk=instance.pk)
+        before = found.values_list(field, flat=True).first()
+    instance._tree_moved = before != getattr(instance, field)  # type: ignore
+    instance._tree_moved_from = before  # type: ignore
+
+
+@receiver(post_save, sender=Unlockable, dispatch_uid="tree_path_unlockable_save")
+@receiver(post_save, sender=Round, dispatch_uid="tree_path_round_save")
+def refresh_moved_tree_paths(sender: type[Model], instance: Model, **kwargs: Any):
+    if not getattr(instance, "_tree_moved", False):
+        return
+    if isinstance(instance, Unlockable):
+        paths = refresh_tree_paths({instance.hunt_id})
+        instance.tree_path = paths.get(instance.pk, "")
+        instance.depth = instance.tree_path.count("/")
+    elif isinstance(instance, Round):
+        refresh_tree_paths(
+            round_hunt_ids(instance._tree_moved_from, instance.unlockable_id)  # type: ignore
+        )
+
+
+@receiver(post_delete, sender=Unlockable, dispatch_uid="tree_path_unlockable_delete")
+@receiver(post_delete, sender=Round, dispatch_uid="tree_path_round_delete")
+def refresh_tree_paths_on_delete(sender: type[Model], instance: Model, **kwargs: Any):
+    # what was inside is cut loose by an update, which sends no signals
+    if isinstance(instance, Unlockable):
+        refresh_tree_paths({instance.hunt_id})
+    elif isinstance(instance, Round):
+        refresh_tree_paths(round_hunt_ids(instance.unlockable_id))
+
+
+@receiver(connection_created, dispatch_uid="sqlite_pragmas")
+def apply_sqlite_pragmas(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any):
+    # journal_mode sticks to the file, the rest only last the connection;
+    # on the raw connection so they don't count against a request's budget
+    if connection.vendor == "sqlite":
+        for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            connection.connection.execute(f"PRAGMA {name} = {value}")
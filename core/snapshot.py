@@ -0,0 +1,231 @@
+"""In-memory read model of the hunts, so hot pages are served without
+going to the database.
+
+Everything in a snapshot is loaded with its related objects attached,
+so following u.hunt, u.parent, u.unlock_needs, puzzle.unlockable,
+puzzle.solution, puzzle.salted_answers and so on costs no queries.
+Snapshots are shared between requests and must not be modified;
+the staff editing views keep going through the ORM.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+
+from .instrumentation import warming_up
+from .models import Hunt, Puzzle, Round, SaltedAnswer, Unlockable
+from .unlock_graph import UnlockGraph
+from .utils import normalize
+from .versions import aget_version, get_version
+
+
+class Node:
+    """An unlockable together with its place in the hunt tree."""
+
+    __slots__ = ("children", "parent", "unlockable")
+
+    def __init__(self, unlockable: Unlockable):
+        self.unlockable = unlockable
+        self.parent: Node | None = None
+        self.children: list[Node] = []
+
+
+class HuntSnapshot:
+    __slots__ = (
+        "answers",
+        "graph",
+        "hashes",
+        "hunt",
+        "nodes",
+        "puzzles",
+        "roots",
+        "rounds",
+        "rounds_by_pk",
+        "unlockables",
+    )
+
+    def __init__(self, hunt: Hunt):
+        self.hunt = hunt
+        unlockables = list(
+            Unlockable.objects.filter(hunt=hunt)
+            .select_related("puzzle__solution", "round")
+            .prefetch_related("puzzle__salted_answers")
+        )
+
+        self.nodes = {u.pk: Node(u) for u in unlockables}
+        self.unlockables: dict[str, Unlockable] = {}
+        self.puzzles: dict[str, Puzzle] = {}
+        self.rounds: dict[str, Round] = {}
+        self.rounds_by_pk: dict[int, Round] = {}
+        rounds_by_pk = self.rounds_by_pk
+        for u in unlockables:
+            self.unlockables[u.slug] = u
+            if u.is_puzzle:
+                self.puzzles[u.puzzle.slug] = u.puzzle
+            if u.is_round:
+                self.rounds[u.round.chapter_number] = u.round
+                rounds_by_pk[u.round.pk] = u.round
+
+        # attach the related objects in memory; lists are already sorted
+        # by the Meta ordering, so the children come out sorted too
+        for u in unlockables:
+            u.hunt = hunt
+            node = self.nodes[u.pk]
+            if (parent := rounds_by_pk.get(u.parent_id or 0)) is not None:
+                u.parent = parent
+                node.parent = self.nodes[parent.unlockable_id or 0]
+                node.parent.children.append(node)
+            if (needed := self.nodes.get(u.unlock_needs_id or 0)) is not None:
+                u.unlock_needs = needed.unlockable
+            if (target := rounds_by_pk.get(u.on_solve_link_to_id or 0)) is not None:
+                u.on_solve_link_to = target
+        self.roots = [
+            node for node in self.nodes.values() if node.unlockable.parent_id is None
+        ]
+        self.graph = UnlockGraph(hunt, unlockables)
+        self.answers = {
+            slug: {sa.normalized_answer: sa for sa in puzzle.salted_answers.all()}
+            for slug, puzzle in self.puzzles.items()
+        }
+        self.hashes = {
+            slug: {sa.hash: sa for sa in puzzle.salted_answers.all()}
+            for slug, puzzle in self.puzzles.items()
+        }
+
+    def top_level(self) -> list[Unlockable]:
+        return [node.unlockable for node in self.roots]
+
+    def children(self, round: Round) -> list[Unlockable]:
+        node = self.nodes.get(round.unlockable_id or 0)
+        if node is None:
+            return []
+        return [child.unlockable for child in node.children]
+
+    def ancestors(self, u: Unlockable) -> list[Round]:
+        """The rounds above `u`, top first."""
+        return [
+            self.rounds_by_pk[pk] for pk in u.ancestor_ids if pk in self.rounds_by_pk
+        ]
+
+    def parent_url(self, u: Unlockable) -> str:
+        """The round `u` is in, or the volume for the top level."""
+        ancestors = self.ancestors(u)
+        return (ancestors[-1] if ancestors else self.hunt).get_absolute_url()
+
+    def get_unlockable(self, slug: str) -> Unlockable:
+        try:
+            return self.unlockables[slug]
+        except KeyError:
+            raise Http404(f"No unlockable {slug}") from None
+
+    def check_answer(self, puzzle: Puzzle, guess: str) -> SaltedAnswer | None:
+        return self.answers[puzzle.slug].get(normalize(guess))
+
+    def match_hash(self, puzzle: Puzzle, digest: str) -> SaltedAnswer | None:
+        return self.hashes[puzzle.slug].get(digest)
+
+    def get_puzzle(self, slug: str) -> Puzzle:
+        try:
+            return self.puzzles[slug]
+        except KeyError:
+            raise Http404(f"No puzzle {slug}") from None
+
+
+class Catalog:
+    """All the hunts at one content version.
+    Hunt snapshots are built the first time they are asked for."""
+
+    __slots__ = (
+        "boundaries",
+        "chapters",
+        "hunts",
+        "puzzle_volumes",
+        "snapshots",
+        "version",
+    )
+
+    def __init__(self, version: int):
+        self.version = version
+        self.hunts = {h.volume_number: h for h in Hunt.objects.order_by("pk")}
+        # every moment at which something unlocks without an edit
+        self.boundaries = sorted(
+            [h.start_date for h in self.hunts.values()]
+            + [h.end_date for h in self.hunts.values()]
+            + list(
+                Unlockable.objects.filter(unlock_date__isnull=False).values_list(
+                    "unlock_date", flat=True
+                )
+            )
+        )
+        self.chapters: dict[str, str] = dict(
+            Round.objects.filter(unlockable__isnull=False).values_list(
+                "chapter_number", "unlockable__hunt__volume_number"
+            )
+        )
+        self.puzzle_volumes: dict[str, str] = dict(
+            Puzzle.objects.filter(unlockable__isnull=False).values_list(
+                "slug", "unlockable__hunt__volume_number"
+            )
+        )
+        self.snapshots: dict[str, HuntSnapshot] = {}
+
+    def epoch(self, now: datetime) -> int:
+        """Number of start, end and unlock dates that have passed;
+        pages only change with time when this does."""
+        return bisect_right(self.boundaries, now)
+
+    def get_hunt_snapshot(self, volume_number: str) -> HuntSnapshot:
+        if (snapshot := self.snapshots.get(volume_number)) is None:
+            if (hunt := self.hunts.get(volume_number)) is None:
+                raise Http404(f"No volume {volume_number}")
+            with warming_up():
+                snapshot = self.snapshots[volume_number] = HuntSnapshot(hunt)
+        return snapshot
+
+
+_catalog: Catalog | None = None
+
+
+def get_catalog() -> Catalog:
+    global _catalog
+    version = get_version()
+    if _catalog is None or _catalog.version != version:
+        with warming_up():
+            _catalog = Catalog(version)
+    return _catalog
+
+
+def get_hunt_snapshot(volume_number: str) -> HuntSnapshot:
+    return get_catalog().get_hunt_snapshot(volume_number)
+
+
+async def aget_catalog() -> Catalog:
+    """get_catalog for async views, only going to a thread to rebuild."""
+    if _catalog is not None and _catalog.version == await aget_version():
+        return _catalog
+    return await sync_to_async(get_catalog)()
+
+
+async def aget_hunt_snapshot(volume_number: str) -> HuntSnapshot:
+    catalog = await aget_catalog()
+    if (snapshot := catalog.snapshots.get(volume_number)) is not None:
+        return snapshot
+    return await sync_to_async(catalog.get_hunt_snapshot)(volume_number)
+
+
+async def aget_puzzle(slug: str) -> tuple[HuntSnapshot, Puzzle]:
+    catalog = await aget_catalog()
+    if (volume_number := catalog.puzzle_volumes.get(slug)) is None:
+        raise Http404(f"No puzzle {slug}")
+    snapshot = await aget_hunt_snapshot(volume_number)
+    return snapshot, snapshot.get_puzzle(slug)
+
+
+def get_chapter(chapter_number: str) -> tuple[HuntSnapshot, Round]:
+    catalog = get_catalog()
+    if (volume_number := catalog.chapters.get(chapter_number)) is None:
+        raise Http404(f"No chapter {chapter_number}")
+    snapshot = catalog.get_hunt_snapshot(volume_number)
+    return snapshot, snapshot.rounds[chapter_number]
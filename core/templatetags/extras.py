@@ -1,6 +1,5 @@
 from typing import Any
 
-import markdown
 from django import template
 from django.contrib.messages import constants as message_constants
 from django.contrib.messages.storage.base import Message
@@ -10,27 +9,11 @@ from django.utils.safestring import mark_safe
 
 import core.progresso
 from core.models import Unlockable
+from core.rendering import render_markdown
 
 register = template.Library()
 
 
-def convert_to_markdown(s: str) -> str:
-    return markdown.markdown(
-        s,
-        extensions=(
-            "extra",
-            "sane_lists",
-            "smarty",
-            "codehilite",
-        ),
-        extension_configs={
-            "codehilite": {
-                "linenums": False,
-            }
-        },
-    )
-
-
 MESSAGE_LEVEL_CLASSES = {
     message_constants.DEBUG: "border-indigo-600 bg-indigo-50 text-indigo-700",
     message_constants.INFO: "border-blue-600 bg-blue-50 text-blue-700",
@@ -66,7 +49,7 @@ def tailwind_message_classes(message: Message) -> str:
 
 @register.filter(is_safe=True)
 def mkd(value: str) -> str:
-    return mark_safe(convert_to_markdown(value))
+    return mark_safe(render_markdown(value))
 
 
 @register.filter(is_safe=True)
@@ -109,28 +92,19 @@ def has_opened(request: HttpRequest, u: Unlockable):
 
 @register.filter()
 def get_tr_class(request: HttpRequest, u: Unlockable):
-    if core.progresso.has_opened(request, u):
-        if u.is_puzzle:
-            if core.progresso.has_solved(request, u):
-                s = "bg-blue-50"
-            else:
-                s = "Bg-yellow-100"
-        elif u.story_only:
-            s = "bg-gray-100"
-        else:
-            s = ""
-    elif core.progresso.check_unlocked(request, u):
-        s = "bg-green-200"
-    elif u.story_only:
-        s = "Bg-gray-200 opacity-50"
-    else:
-        s = "opacity-50"
-
-    if (puzzle := getattr(u, "puzzle", None)) is not None and puzzle.is_meta:
-        s += " font-bold"
-    return s
+    return core.progresso.get_row_class(
+        u,
+        unlocked=core.progresso.check_unlocked(request, u),
+        opened=core.progresso.has_opened(request, u),
+        solved=core.progresso.has_solved(request, u),
+    )
 
 
 @register.filter()
 def get_finished_url(request: HttpRequest, u: Unlockable):
     return core.progresso.get_finished_url(request, u)
+
+
+@register.filter()
+def parent_url(u: Unlockable):
+    return core.progresso.get_parent_url(u)
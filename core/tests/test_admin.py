@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.factories import HuntFactory, UserFactory
+from core.instrumentation import query_budget
+from core.management.commands.bench_views import build_hunt
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class AdminChangelistBudgetTest(TestCase):
+    """Each changelist over enough rows that a query per row would show."""
+
+    @classmethod
+    def setUpTestData(cls):
+        build_hunt("A", chapters=2, puzzles=4, depth=2, answers=3)
+        HuntFactory.create_batch(3)
+        cls.superuser = UserFactory.create(is_staff=True, is_superuser=True)
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def assertWithinBudget(self, model: str):
+        url_name = f"core_{model}_changelist"
+        url = reverse(f"admin:{url_name}")
+        with query_budget(settings.QUERY_BUDGETS[url_name]):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.context["cl"].result_count, 3)
+
+    def test_hunt_changelist(self):
+        self.assertWithinBudget("hunt")
+
+    def test_round_changelist(self):
+        self.assertWithinBudget("round")
+
+    def test_unlockable_changelist(self):
+        self.assertWithinBudget("unlockable")
+
+    def test_puzzle_changelist(self):
+        self.assertWithinBudget("puzzle")
+
+    def test_solution_changelist(self):
+        self.assertWithinBudget("solution")
+
+    def test_saltedanswer_changelist(self):
+        self.assertWithinBudget("saltedanswer")
@@ -0,0 +1,123 @@
+from typing import Any
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import include, path
+
+from core import views
+from core.management.commands.bench_views import build_hunt
+from core.models import Puzzle, SaltedAnswer
+
+# both views side by side, whichever ASYNC_AJAX picked for /ajax
+urlpatterns = [
+    path("sync/ajax", views.ajax),
+    path("async/ajax", views.ajax_async),
+    path("", include(settings.ROOT_URLCONF)),
+]
+
+
+class AjaxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("A", chapters=1, puzzles=2, depth=1, answers=2)
+        cls.puzzle = Puzzle.objects.get(slug="a-p-0-0")
+        cls.answer = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=True)
+        cls.partial = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=False)
+
+    def check(self, guess: str, slug: str | None = None):
+        return self.client.post(
+            "/ajax",
+            {
+                "action": "check",
+                "guess": guess,
+                "volume_number": self.hunt.volume_number,
+                "puzzle_slug": slug or self.puzzle.slug,
+            },
+        )
+
+    def test_check_correct(self):
+        response = self.check(self.answer.display_answer.lower())
+        self.assertEqual(
+            response.json(), {"correct": 1, "url": self.puzzle.get_solution_url()}
+        )
+
+    def test_check_partial(self):
+        response = self.check(self.partial.display_answer)
+        self.assertEqual(
+            response.json(), {"correct": 0.5, "message": self.partial.message}
+        )
+
+    def test_check_wrong(self):
+        self.assertEqual(self.check("nope").json(), {"correct": 0})
+
+    def test_check_unknown_slug(self):
+        self.assertEqual(self.check("nope", slug="no-such-puzzle").status_code, 404)
+
+    def test_guess_unknown_slug(self):
+        response = self.client.post(
+            "/ajax",
+            {"action": "guess", "guess": "x", "salt": 0, "puzzle_slug": "no-such"},
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AjaxParityTest(TestCase):
+    """The async view answers every request as the sync one does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("P", chapters=1, puzzles=2, depth=1, answers=2)
+        cls.puzzle = Puzzle.objects.get(slug="p-p-0-0")
+        cls.answer = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=True)
+        cls.partial = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=False)
+
+    def post(self, view: str, data: dict[str, Any]) -> tuple[int, Any, Any]:
+        """The status, the JSON if any, and the progress left in the session."""
+        client = self.client_class()
+        response = client.post(f"/{view}/ajax", data)
+        is_json = response["Content-Type"] == "application/json"
+        body = response.json() if is_json else None
+        return response.status_code, body, client.session.get("solved")
+
+    def assertSameResponse(self, data: dict[str, Any]) -> int:
+        sync = self.post("sync", data)
+        self.assertEqual(sync, self.post("async", data))
+        return sync[0]
+
+    def test_same_responses(self):
+        guess = {"action": "guess", "puzzle_slug": self.puzzle.slug}
+        check = {
+            "action": "check",
+            "volume_number": self.hunt.volume_number,
+            "puzzle_slug": self.puzzle.slug,
+        }
+        cases = {
+            "guess by hash": dict(
+                guess, guess=self.answer.display_answer, hash=self.answer.hash
+            ),
+            "guess by salt": dict(
+                guess, guess=self.answer.display_answer, salt=self.answer.salt
+            ),
+            "partial guess": dict(
+                guess, guess=self.partial.display_answer, hash=self.partial.hash
+            ),
+            "hash of another guess": dict(guess, guess="nope", hash=self.answer.hash),
+            "wrong guess": dict(guess, guess="nope", salt=self.answer.salt),
+            "check": dict(check, guess=self.answer.display_answer),
+            "partial check": dict(check, guess=self.partial.display_answer),
+            "wrong check": dict(check, guess="nope"),
+            "guess, bad slug": dict(guess, guess="nope", salt=0, puzzle_slug="x"),
+            "check, bad slug": dict(check, guess="nope", puzzle_slug="x"),
+            "check, bad volume": dict(check, guess="nope", volume_number="x"),
+            "bad action": {"action": "shout"},
+        }
+        statuses = {}
+        for name, data in cases.items():
+            with self.subTest(name):
+                statuses[name] = self.assertSameResponse(data)
+        # and the cases reached what they meant to
+        self.assertEqual(statuses["check"], 200)
+        self.assertEqual(statuses["guess, bad slug"], 404)
+        self.assertEqual(statuses["check, bad slug"], 404)
+        self.assertEqual(statuses["bad action"], 400)
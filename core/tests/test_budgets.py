@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from core.instrumentation import QueryBudgetExceeded, query_budget
+from core.management.commands.bench_views import build_hunt
+from core.models import Puzzle, Round, SaltedAnswer
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class SolverViewBudgetTest(TestCase):
+    """Every budgeted solver view, run twice so both the request that
+    fills the in-memory caches and the ones that reuse them are checked."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("Q", chapters=2, puzzles=4, depth=2, answers=3)
+        cls.round = Round.objects.get(chapter_number="Q-0")
+        cls.puzzle = Puzzle.objects.get(slug="q-p-0-0")
+        cls.answer = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=True)
+
+    def assertWithinBudget(self, url_name: str, fetch):
+        for _ in range(2):
+            with query_budget(settings.QUERY_BUDGETS[url_name]):
+                response = fetch()
+            self.assertEqual(response.status_code, 200)
+
+    def test_hunt_list(self):
+        self.assertWithinBudget("hunt-list", lambda: self.client.get("/"))
+
+    def test_round_unlockable_list(self):
+        url = self.hunt.get_absolute_url()
+        self.assertWithinBudget("round-unlockable-list", lambda: self.client.get(url))
+
+    def test_unlockable_list(self):
+        url = self.round.get_absolute_url()
+        self.assertWithinBudget("unlockable-list", lambda: self.client.get(url))
+
+    def test_puzzle_detail(self):
+        url = self.puzzle.get_absolute_url()
+        self.assertWithinBudget("puzzle-detail", lambda: self.client.get(url))
+
+    def test_ajax_guess(self):
+        data = {
+            "action": "guess",
+            "guess": self.answer.display_answer,
+            "salt": self.answer.salt,
+            "hash": self.answer.hash,
+            "puzzle_slug": self.puzzle.slug,
+        }
+        self.assertWithinBudget("ajax", lambda: self.client.post("/ajax", data))
+
+    def test_ajax_check(self):
+        data = {
+            "action": "check",
+            "guess": self.answer.display_answer,
+            "volume_number": self.hunt.volume_number,
+            "puzzle_slug": self.puzzle.slug,
+        }
+        self.assertWithinBudget("ajax", lambda: self.client.post("/ajax", data))
+
+    @override_settings(QUERY_BUDGETS={"ajax": 0})
+    def test_over_budget_fails(self):
+        data = {"action": "guess", "puzzle_slug": self.puzzle.slug, "guess": "x"}
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.post("/ajax", data)
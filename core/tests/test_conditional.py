@@ -0,0 +1,67 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.management.commands.bench_views import build_hunt
+from core.models import Puzzle, Round, SaltedAnswer
+from core.versions import bump_version
+
+
+class ConditionalPageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("C", chapters=1, puzzles=2, depth=1, answers=1)
+        cls.puzzle = Puzzle.objects.get(slug="c-p-0-0")
+        cls.answer = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=True)
+        cls.url = cls.puzzle.get_absolute_url()
+
+    def etag(self) -> str:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_revisit_is_not_modified(self):
+        etag = self.etag()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_stale_etag_gets_the_page(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.puzzle.name)
+
+    def test_etag_changes_with_progress(self):
+        before = self.etag()
+        self.client.post(
+            "/ajax",
+            {
+                "action": "guess",
+                "guess": self.answer.display_answer,
+                "hash": self.answer.hash,
+                "puzzle_slug": self.puzzle.slug,
+            },
+        )
+        after = self.etag()
+        self.assertNotEqual(before, after)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=before)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_with_content_version(self):
+        before = self.etag()
+        bump_version()
+        self.assertNotEqual(before, self.etag())
+
+    def test_etag_changes_with_epoch(self):
+        before = self.etag()
+        later = self.hunt.end_date + timedelta(minutes=1)
+        with mock.patch.object(timezone, "now", return_value=later):
+            self.assertNotEqual(before, self.etag())
+
+    def test_etag_differs_per_page(self):
+        before = self.etag()
+        self.url = Round.objects.get(chapter_number="C-0").get_absolute_url()
+        self.assertNotEqual(before, self.etag())
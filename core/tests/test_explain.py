@@ -0,0 +1,158 @@
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.management.commands.bench_views import build_hunt
+from core.models import Puzzle, Round, SaltedAnswer
+from core.page_cache import page_cache
+from core.snapshot import HuntSnapshot, get_catalog
+from info.context_processors import get_listed_pages
+from info.models import Page
+
+SQLITE_SEARCH = re.compile(
+    r"SEARCH (\S+) USING (?:COVERING INDEX \S+|INDEX \S+|INTEGER PRIMARY KEY) \((.*)\)"
+)
+
+Plan = tuple[list[str], set[tuple[str, tuple[str, ...]]]]
+
+
+def sqlite_plan(details: list[str]) -> Plan:
+    """The full-table reads in a plan, and each table searched
+    with the columns of the index it was searched on."""
+    problems, searches = [], set()
+    for detail in details:
+        # a SCAN is fine if it walks an index, as for an IN list
+        if detail.startswith("SCAN ") and "INDEX" not in detail:
+            problems.append(detail)
+        elif match := SQLITE_SEARCH.match(detail):
+            columns = re.findall(r"(\w+)[=<>]", match.group(2))
+            columns = ["id" if c == "rowid" else c for c in columns]
+            searches.add((match.group(1), tuple(columns)))
+    return problems, searches
+
+
+def mysql_plan(plan: str) -> Plan:
+    problems, searches = [], set()
+
+    def walk(node: Any):
+        if isinstance(node, dict):
+            if node.get("access_type") == "ALL":
+                problems.append(f"full scan of {node.get('table_name')}")
+            elif "used_key_parts" in node:
+                searches.add((node["table_name"], tuple(node["used_key_parts"])))
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(json.loads(plan))
+    return problems, searches
+
+
+@skipUnless(connection.vendor in ("sqlite", "mysql"), "reads sqlite and mysql plans")
+class SolverQueryPlanTest(TestCase):
+    """EXPLAIN the queries the solver views run, as captured from the views
+    themselves: none may read a whole table, and the hot ones must search
+    the index expected of them, named by its table and columns. The catalog
+    and the navigation are loaded first where it matters: they read every
+    row on purpose, and only after an edit."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("E", chapters=2, puzzles=4, depth=2, answers=3)
+        cls.round = Round.objects.get(chapter_number="E-0")
+        cls.puzzle = Puzzle.objects.get(slug="e-p-0-0")
+        cls.answer = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=True)
+        cls.page = Page.objects.create(title="Rules", slug="rules", content="")
+
+    def explain(self, sql: str) -> Plan:
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute("EXPLAIN FORMAT=JSON " + sql)
+                return mysql_plan(cursor.fetchone()[0])
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return sqlite_plan([row[-1] for row in cursor.fetchall()])
+
+    def searches(self, run: Callable[[], Any]) -> set[tuple[str, tuple[str, ...]]]:
+        """The tables the SELECTs of `run` search, each with the columns
+        of the index used, failing if any reads a whole table."""
+        with CaptureQueriesContext(connection) as captured:
+            run()
+        found = set()
+        for query in captured:
+            if query["sql"].startswith("SELECT"):
+                problems, searches = self.explain(query["sql"])
+                self.assertEqual(problems, [], query["sql"])
+                found |= searches
+        return found
+
+    def guess(self, **fields: Any):
+        data = {
+            "action": "guess",
+            "guess": self.answer.display_answer,
+            "puzzle_slug": self.puzzle.slug,
+        }
+        self.assertEqual(
+            self.client.post("/ajax", dict(data, **fields)).status_code, 200
+        )
+
+    def test_guess_by_hash(self):
+        searches = self.searches(lambda: self.guess(hash=self.answer.hash))
+        self.assertIn(("core_puzzle", ("slug",)), searches)
+        self.assertIn(("core_saltedanswer", ("puzzle_id", "hash")), searches)
+
+    def test_guess_by_salt(self):
+        searches = self.searches(lambda: self.guess(salt=self.answer.salt))
+        self.assertIn(("core_puzzle", ("slug",)), searches)
+        self.assertIn(("core_saltedanswer", ("puzzle_id", "salt")), searches)
+
+    def test_snapshot_build(self):
+        searches = self.searches(lambda: HuntSnapshot(self.hunt))
+        # the hunt's unlockables, with their puzzles, solutions and rounds
+        self.assertIn(("core_unlockable", ("hunt_id",)), searches)
+        self.assertIn(("core_puzzle", ("unlockable_id",)), searches)
+        self.assertIn(("core_solution", ("puzzle_id",)), searches)
+        self.assertIn(("core_round", ("unlockable_id",)), searches)
+        # then the answers of all its puzzles
+        self.assertIn(("core_saltedanswer", ("puzzle_id",)), searches)
+
+    def test_page_by_slug(self):
+        get_catalog()
+        get_listed_pages()
+        searches = self.searches(lambda: self.client.get(self.page.get_absolute_url()))
+        self.assertIn(("info_page", ("slug",)), searches)
+
+    def test_solver_queries_use_indexes(self):
+        get_catalog()
+        get_listed_pages()
+        page_cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            for url in (
+                "/",
+                self.hunt.get_absolute_url(),
+                self.round.get_absolute_url(),
+                self.puzzle.get_absolute_url(),
+                self.puzzle.get_solution_url(),
+                self.page.get_absolute_url(),
+            ):
+                self.client.get(url)
+            guess = {
+                "action": "guess",
+                "guess": self.answer.display_answer,
+                "puzzle_slug": self.puzzle.slug,
+            }
+            self.client.post("/ajax", dict(guess, hash=self.answer.hash))
+            self.client.post("/ajax", dict(guess, salt=self.answer.salt))
+
+        selects = [q["sql"] for q in captured if q["sql"].startswith("SELECT")]
+        self.assertTrue(selects)
+        for sql in selects:
+            with self.subTest(sql=sql):
+                self.assertEqual(self.explain(sql)[0], [])
@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase
+
+from core.instrumentation import percentile
+
+
+class PercentileTest(SimpleTestCase):
+    def test_interpolates_between_samples(self):
+        self.assertAlmostEqual(percentile([10, 20], 95), 19.5)
+        self.assertAlmostEqual(percentile([10, 20, 30, 40, 50], 50), 30)
+        self.assertAlmostEqual(percentile([10, 20, 30, 40, 50], 95), 48)
+
+    def test_stays_within_the_samples(self):
+        samples = [27.396, 3.1, 4.2, 5.0, 2.9, 3.3]
+        for p in (1, 50, 95, 99):
+            with self.subTest(p=p):
+                self.assertGreaterEqual(percentile(samples, p), min(samples))
+                self.assertLessEqual(percentile(samples, p), max(samples))
+
+    def test_unsorted_input(self):
+        self.assertAlmostEqual(percentile([50, 10, 40, 20, 30], 50), 30)
+
+    def test_single_sample(self):
+        self.assertEqual(percentile([7.5], 95), 7.5)
@@ -0,0 +1,174 @@
+import logging
+import queue
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+
+from core.logs import BatchingQueueListener
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.times: list[float] = []
+        self.emitted = threading.Semaphore(0)
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+        self.times.append(time.monotonic())
+        self.emitted.release()
+
+    def wait(self):
+        if not self.emitted.acquire(timeout=5):
+            raise AssertionError("no batch was sent")
+
+
+def record(message: str, level: int = logging.ERROR) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {"msg": message, "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+
+
+class BatchingQueueListenerTest(SimpleTestCase):
+    def setUp(self):
+        self.target = ListHandler()
+
+    def listen(self, *records: logging.LogRecord, **kwargs) -> BatchingQueueListener:
+        """A listener started with `records` already queued."""
+        listener = BatchingQueueListener(queue.Queue(), self.target, **kwargs)
+        for r in records:
+            listener.queue.put(r)
+        listener.start()
+        self.addCleanup(lambda: listener._thread and listener.stop())
+        return listener
+
+    def test_lone_record_is_sent_as_is(self):
+        lone = record("Something broke")
+        self.listen(lone, interval=0.01).stop()
+        self.assertEqual(self.target.records, [lone])
+
+    def test_records_within_interval_are_one_batch(self):
+        self.listen(
+            record("first", logging.WARNING),
+            record("second", logging.ERROR),
+            record("third", logging.WARNING),
+            interval=60,
+        ).stop()
+        self.assertEqual(len(self.target.records), 1)
+        batch = self.target.records[0]
+        self.assertEqual(batch.getMessage(), "first\n\nsecond\n\nthird")
+        self.assertEqual(batch.levelno, logging.ERROR)
+
+    def test_batch_is_sent_when_interval_ends(self):
+        self.listen(record("first"), record("second"), interval=0.05)
+        self.target.wait()
+        self.assertEqual(self.target.records[0].getMessage(), "first\n\nsecond")
+
+    def test_repeats_are_counted(self):
+        self.listen(
+            record("again"),
+            record("once"),
+            record("again"),
+            record("again"),
+            interval=60,
+        ).stop()
+        self.assertEqual(
+            self.target.records[0].getMessage(), "again\n(repeated 3x)\n\nonce"
+        )
+
+    def test_same_message_at_another_level_is_kept(self):
+        self.listen(
+            record("odd", logging.WARNING), record("odd", logging.ERROR), interval=60
+        ).stop()
+        self.assertEqual(self.target.records[0].getMessage(), "odd\n\nodd")
+
+    def test_records_past_max_are_only_counted(self):
+        self.listen(
+            *(record(f"view {i}") for i in range(5)),
+            record("view 0"),
+            interval=60,
+            max_records=2,
+        ).stop()
+        self.assertEqual(
+            self.target.records[0].getMessage(),
+            "view 0\n(repeated 2x)\n\nview 1\n\n... and 3 more records",
+        )
+
+    def test_batches_are_rate_limited(self):
+        # one batch per 0.2s, though each closes after 0.01s
+        listener = self.listen(record("first"), interval=0.01, per_minute=300)
+        self.target.wait()
+        listener.queue.put(record("second"))
+        listener.queue.put(record("third"))
+        self.target.wait()
+        self.assertGreaterEqual(self.target.times[1] - self.target.times[0], 0.2)
+        self.assertEqual(self.target.records[1].getMessage(), "second\n\nthird")
+
+    def test_counts_reset_after_each_batch(self):
+        listener = self.listen(
+            *(record(f"view {i}") for i in range(3)),
+            interval=0.01,
+            per_minute=6000,
+            max_records=1,
+        )
+        self.target.wait()
+        listener.queue.put(record("later"))
+        listener.stop()
+        self.assertEqual(
+            [r.getMessage() for r in self.target.records],
+            ["view 0\n\n... and 2 more records", "later"],
+        )
+
+
+# the discord_queue entry of LOGGING, sending to a list instead
+DICT_CONFIG = """
+import atexit, logging, logging.config
+from django.conf import settings
+settings.configure(LOG_BATCH_SECONDS=60)
+from core.logs import BatchingQueueListener, start_queue_listeners
+
+class ListHandler(logging.Handler):
+    records = []
+    def emit(self, record):
+        self.records.append(record)
+
+logging.config.dictConfig({
+    "version": 1,
+    "handlers": {
+        "target": {"()": ListHandler},
+        "queue": {
+            "class": "logging.handlers.QueueHandler",
+            "handlers": ["target"],
+            "listener": "core.logs.BatchingQueueListener",
+            "respect_handler_level": True,
+        },
+    },
+    "root": {"handlers": ["queue"], "level": "INFO"},
+})
+start_queue_listeners()
+listener = logging.getLogger().handlers[0].listener
+assert isinstance(listener, BatchingQueueListener), listener
+logging.error("first")
+logging.error("second")
+atexit.unregister(listener.stop)
+listener.stop()
+assert [r.getMessage() for r in ListHandler.records] == ["first\\n\\nsecond"]
+"""
+
+
+@skipIf(sys.version_info < (3, 12), "dictConfig builds queue listeners from 3.12")
+class QueueListenerConfigTest(SimpleTestCase):
+    def test_settings_form_builds_a_batching_listener(self):
+        # in a new interpreter, since dictConfig replaces the handlers of this one
+        subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(DICT_CONFIG)],
+            cwd=Path(__file__).resolve().parents[2],
+            check=True,
+        )
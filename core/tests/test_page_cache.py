@@ -0,0 +1,60 @@
+from django.test import TestCase
+
+from core.factories import UserFactory
+from core.management.commands.bench_views import build_hunt
+from core.models import Puzzle, Round, SaltedAnswer
+from core.page_cache import page_cache
+
+
+class PageCacheIsolationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("K", chapters=1, puzzles=2, depth=1, answers=1)
+        cls.round = Round.objects.get(chapter_number="K-0")
+        cls.puzzle = Puzzle.objects.get(slug="k-p-0-0")
+        cls.answer = SaltedAnswer.objects.get(puzzle=cls.puzzle, is_correct=True)
+        cls.url = cls.round.get_absolute_url()
+        cls.staff = UserFactory.create(is_staff=True)
+
+    def setUp(self):
+        page_cache.clear()
+
+    def solver(self, solved: bool = False):
+        client = self.client_class()
+        if solved:
+            client.post(
+                "/ajax",
+                {
+                    "action": "guess",
+                    "guess": self.answer.display_answer,
+                    "hash": self.answer.hash,
+                    "puzzle_slug": self.puzzle.slug,
+                },
+            )
+        return client
+
+    def test_solvers_with_different_progress_get_their_own_page(self):
+        fresh = self.solver()
+        solved = self.solver(solved=True)
+        self.assertContains(solved.get(self.url), self.puzzle.get_solution_url())
+        self.assertNotContains(fresh.get(self.url), self.puzzle.get_solution_url())
+        self.assertContains(solved.get(self.url), self.puzzle.get_solution_url())
+
+    def test_solvers_with_the_same_progress_share_a_page(self):
+        first = self.solver(solved=True).get(self.url)
+        hits = page_cache.stats()["hits"]
+        second = self.solver(solved=True).get(self.url)
+        self.assertEqual(page_cache.stats()["hits"], hits + 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_staff_pages_are_never_shared(self):
+        staff = self.client_class()
+        staff.force_login(self.staff)
+        editor_url = self.round.get_editor_url()
+        self.assertContains(staff.get(self.url), editor_url)
+        self.assertEqual(page_cache.stats()["entries"], 0)
+        # a solver with the same progress gets no staff links
+        self.assertNotContains(self.solver().get(self.url), editor_url)
+        # and staff still get them after the solver's page was cached
+        self.assertEqual(page_cache.stats()["entries"], 1)
+        self.assertContains(staff.get(self.url), editor_url)
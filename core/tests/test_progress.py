@@ -0,0 +1,69 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from core.factories import HuntFactory, UnlockableFactory
+from core.progress_codec import VERSION, decode_pks, encode_pks
+from core.progresso import get_solved_pks, has_solved, mark_solved
+
+
+class ProgressCodecTest(SimpleTestCase):
+    def test_round_trip(self):
+        for pks in ({7}, {1, 2, 3}, {100, 164, 101, 250}, set(range(40, 90, 3))):
+            with self.subTest(pks=pks):
+                self.assertEqual(decode_pks(encode_pks(pks)), pks)
+
+    def test_empty(self):
+        self.assertEqual(encode_pks([]), "")
+        self.assertEqual(decode_pks(""), set())
+
+    def test_contiguous_pks_stay_small(self):
+        encoded = encode_pks(range(5000, 5100))
+        self.assertLess(len(encoded), 30)
+
+    def test_malformed_decodes_to_empty(self):
+        for s in ("garbage", "1.x.AQ", "1.5.!!", "1.5", "1.5.AQ.AQ", f"{VERSION}"):
+            with self.subTest(s=s):
+                self.assertEqual(decode_pks(s), set())
+
+    def test_other_version_decodes_to_empty(self):
+        encoded = encode_pks({5, 6})
+        stale = str(VERSION + 1) + encoded[encoded.index(".") :]
+        self.assertEqual(decode_pks(stale), set())
+
+
+class ProgressSessionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = HuntFactory.create()
+        cls.unlockables = UnlockableFactory.create_batch(3, hunt=cls.hunt)
+
+    def request(self, **session):
+        request = RequestFactory().get("/")
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        request.session.update(session)
+        return request
+
+    def test_marked_solves_are_stored_encoded(self):
+        request = self.request()
+        u = self.unlockables[1]
+        mark_solved(request, u)
+        self.assertTrue(has_solved(request, u))
+        self.assertFalse(has_solved(request, self.unlockables[0]))
+        self.assertEqual(
+            request.session["solved"], {str(self.hunt.pk): encode_pks({u.pk})}
+        )
+
+    def test_legacy_list_is_migrated(self):
+        pks = [u.pk for u in self.unlockables[:2]]
+        # a pk since deleted is dropped
+        request = self.request(solved=[*pks, 999999])
+        self.assertEqual(get_solved_pks(request), set(pks))
+        self.assertEqual(
+            request.session["solved"], {str(self.hunt.pk): encode_pks(pks)}
+        )
+
+    def test_malformed_cookie_is_no_progress(self):
+        request = self.request(solved={str(self.hunt.pk): "nonsense", "x": "1.1.AQ"})
+        self.assertEqual(get_solved_pks(request), set())
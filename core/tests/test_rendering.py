@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.db.models.signals import pre_save
+from django.test import TestCase
+
+from core.factories import PuzzleFactory
+from core.models import Puzzle
+from core.rendering import MARKDOWN_CONFIG_VERSION, MarkdownCache
+
+
+class RenderOnSaveTest(TestCase):
+    def test_save_renders_html(self):
+        puzzle = PuzzleFactory.create(content="*hello*")
+        puzzle.refresh_from_db()
+        self.assertEqual(puzzle.content_html, "<p><em>hello</em></p>")
+        self.assertEqual(puzzle.rendered_version, MARKDOWN_CONFIG_VERSION)
+
+    def test_update_fields_with_markdown_renders(self):
+        puzzle = PuzzleFactory.create(content="*hello*")
+        puzzle.content = "**bye**"
+        puzzle.save(update_fields=["content"])
+        puzzle.refresh_from_db()
+        self.assertEqual(puzzle.content_html, "<p><strong>bye</strong></p>")
+
+    def test_update_fields_without_markdown_skips(self):
+        puzzle = PuzzleFactory.create()
+        with mock.patch.object(Puzzle, "render_markdown_fields") as render:
+            puzzle.name = "Renamed"
+            puzzle.save(update_fields=["name"])
+        render.assert_not_called()
+
+    def test_only_models_with_html_are_connected(self):
+        self.assertTrue(pre_save.has_listeners(Puzzle))
+        self.assertFalse(pre_save.has_listeners(Session))
+
+
+class MarkdownCacheTest(TestCase):
+    def test_repeat_is_served_in_process(self):
+        mkd = MarkdownCache(maxsize=4, timeout=None)
+        html = mkd.render("*lru*")
+        with mock.patch("core.rendering.cache") as shared:
+            self.assertEqual(mkd.render("*lru*"), html)
+        shared.get.assert_not_called()
+        self.assertEqual(mkd.stats()["hits"], 1)
+
+    def test_other_worker_reuses_shared_render(self):
+        MarkdownCache(maxsize=4, timeout=None).render("*shared*")
+        other = MarkdownCache(maxsize=4, timeout=None)
+        with mock.patch("core.rendering.convert_to_markdown") as convert:
+            self.assertEqual(other.render("*shared*"), "<p><em>shared</em></p>")
+        convert.assert_not_called()
+        self.assertEqual(other.stats()["shared_hits"], 1)
+
+    def test_size_is_bounded(self):
+        mkd = MarkdownCache(maxsize=2, timeout=None)
+        for text in ("one", "two", "one", "three"):
+            mkd.render(text)
+        stats = mkd.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        # "two" was least recently used
+        self.assertEqual(list(mkd.lru), [mkd.key("one"), mkd.key("three")])
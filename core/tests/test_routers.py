@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from typing import ClassVar
+from unittest import skipUnless
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.factories import HuntFactory, PuzzleFactory, SaltedAnswerFactory, UserFactory
+from core.models import Hunt
+from core.page_cache import page_cache
+from core.routers import REPLICA, ReplicaMiddleware
+from info.models import Page
+
+
+@skipUnless(
+    REPLICA in connections and connections[REPLICA].vendor == "sqlite",
+    "copies a SQLite primary over its replica",
+)
+@override_settings(READ_REPLICA=True)
+class ReplicaRouterTest(TransactionTestCase):
+    """The replica is copied from the primary, which is then edited,
+    so each read shows which of the two it came from."""
+
+    databases: ClassVar[set[str]] = {"default", REPLICA}
+
+    def setUp(self):
+        page_cache.clear()
+        self.page = Page.objects.create(
+            title="Rules", slug="rules", content="Before", published=True
+        )
+        call_command("sync_replica", stdout=StringIO())
+        # the replica lags behind this edit
+        self.page.content = "After"
+        self.page.save()
+
+    def test_solver_gets_read_from_replica(self):
+        response = self.client.get(self.page.get_absolute_url())
+        self.assertContains(response, "Before")
+        self.assertNotContains(response, "After")
+
+    def test_staff_gets_read_from_primary(self):
+        self.client.force_login(UserFactory.create(is_staff=True))
+        self.assertContains(self.client.get(self.page.get_absolute_url()), "After")
+
+    def test_posts_read_from_primary(self):
+        # only on the primary
+        puzzle = PuzzleFactory.create()
+        answer = SaltedAnswerFactory.create(puzzle=puzzle, is_correct=True)
+        response = self.client.post(
+            "/ajax",
+            {
+                "action": "guess",
+                "guess": answer.display_answer,
+                "hash": answer.hash,
+                "puzzle_slug": puzzle.slug,
+            },
+        )
+        self.assertEqual(response.json()["correct"], 1)
+
+    def test_snapshot_is_built_from_primary(self):
+        now = timezone.now()
+        hunt = HuntFactory.create(
+            visible=True,
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=30),
+        )
+        self.assertFalse(Hunt.objects.using(REPLICA).filter(pk=hunt.pk).exists())
+        self.assertContains(self.client.get(hunt.get_absolute_url()), hunt.name)
+
+    def test_writes_go_to_primary(self):
+        def view(request):
+            page = Page.objects.get(pk=self.page.pk)
+            self.assertEqual(page.content_html, "<p>Before</p>")
+            page.title = "Saved"
+            page.save()
+            Page.objects.create(title="New", slug="new", content="")
+            return HttpResponse()
+
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        ReplicaMiddleware(view)(request)
+
+        primary = Page.objects.using("default")
+        self.assertEqual(primary.get(pk=self.page.pk).title, "Saved")
+        self.assertTrue(primary.filter(slug="new").exists())
+        replica = Page.objects.using(REPLICA)
+        self.assertEqual(replica.get(pk=self.page.pk).content, "Before")
+        self.assertFalse(replica.filter(slug="new").exists())
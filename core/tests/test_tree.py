@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from core.management.commands.bench_views import build_hunt
+from core.models import Puzzle, Round, Unlockable
+
+
+class TreePathTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hunt = build_hunt("T", chapters=2, puzzles=2, depth=3, answers=1)
+        build_hunt("U", chapters=1, puzzles=1, depth=1, answers=1)
+        cls.top = Round.objects.get(chapter_number="T-0")
+        cls.middle = Round.objects.get(chapter_number="T-0-1")
+        cls.bottom = Round.objects.get(chapter_number="T-0-1-2")
+        cls.other = Round.objects.get(chapter_number="T-1")
+
+    def test_paths_follow_nesting(self):
+        puzzle = Puzzle.objects.get(slug="t-p-0-1-2-0")
+        self.assertEqual(
+            puzzle.unlockable.ancestor_ids,
+            [self.top.pk, self.middle.pk, self.bottom.pk],
+        )
+        self.assertEqual(puzzle.unlockable.depth, 3)
+
+    def test_moving_a_round_moves_what_is_inside(self):
+        u = self.middle.unlockable
+        u.parent = self.other
+        u.save()
+        puzzle = Puzzle.objects.get(slug="t-p-0-1-2-0")
+        self.assertEqual(
+            puzzle.unlockable.ancestor_ids,
+            [self.other.pk, self.middle.pk, self.bottom.pk],
+        )
+        self.assertEqual(u.tree_path, f"{self.other.pk}/")
+
+    def test_move_only_refreshes_its_hunt(self):
+        u = self.middle.unlockable
+        u.parent = self.other
+        with mock.patch("core.signals.refresh_tree_paths", return_value={}) as refresh:
+            u.save()
+        refresh.assert_called_once_with({self.hunt.pk})
+
+    def test_other_edits_do_not_refresh(self):
+        u = self.middle.unlockable
+        u.name = "Renamed"
+        with mock.patch("core.signals.refresh_tree_paths") as refresh:
+            u.save()
+            self.bottom.name = "Renamed"
+            self.bottom.save()
+            u.save(update_fields=["name"])
+        refresh.assert_not_called()
+
+    def test_deleting_a_round_cuts_loose_what_is_inside(self):
+        self.middle.delete()
+        u = Unlockable.objects.get(pk=self.bottom.unlockable_id)
+        self.assertEqual(u.tree_path, "")
+        puzzle = Puzzle.objects.get(slug="t-p-0-1-2-0")
+        self.assertEqual(puzzle.unlockable.ancestor_ids, [self.bottom.pk])
+
+    def test_back_links_go_to_the_round_above(self):
+        response = self.client.get(self.bottom.get_absolute_url())
+        self.assertContains(
+            response, f'href="{self.middle.get_absolute_url()}">Back to previous round'
+        )
+        response = self.client.get(self.top.get_absolute_url())
+        self.assertContains(
+            response, f'href="{self.hunt.get_absolute_url()}">Back to chapter listing'
+        )
+
+    def test_puzzle_links_back_to_its_round(self):
+        puzzle = Puzzle.objects.get(slug="t-p-0-1-2-0")
+        response = self.client.get(puzzle.get_absolute_url())
+        self.assertContains(
+            response, f'href="{self.bottom.get_absolute_url()}">Back to round'
+        )
+        self.assertEqual(puzzle.get_parent_url(), self.bottom.get_absolute_url())
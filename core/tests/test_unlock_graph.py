@@ -0,0 +1,150 @@
+from copy import copy
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.factories import HuntFactory, PuzzleFactory, RoundFactory
+from core.models import Unlockable
+from core.progresso import get_unlock_graph
+from core.unlock_graph import UnlockGraph
+
+
+class UnlockGraphTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.hunt = HuntFactory.create(
+            visible=True,
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=30),
+        )
+
+    def puzzle(self, slug: str, **fields) -> Unlockable:
+        fields.setdefault("courage_bounty", 10)
+        fields = {f"unlockable__{k}": v for k, v in fields.items()}
+        return PuzzleFactory.create(
+            unlockable__hunt=self.hunt, unlockable__slug=slug, **fields
+        ).unlockable
+
+    def needs(self, u: Unlockable, needed: Unlockable):
+        u.unlock_needs = needed
+        u.save()
+
+    def graph(self) -> UnlockGraph:
+        return UnlockGraph(
+            self.hunt, Unlockable.objects.filter(hunt=self.hunt).order_by("pk")
+        )
+
+    def test_reachable_hunt_has_no_problems(self):
+        first = self.puzzle("first")
+        second = self.puzzle("second", unlock_courage_threshold=10)
+        self.needs(second, first)
+        graph = self.graph()
+        self.assertEqual(graph.problems, {})
+        self.assertEqual(graph.max_courage, 20)
+        self.assertEqual(
+            [(row.unlockable, row.courage) for row in graph.rows()],
+            [(first, 0), (second, 10)],
+        )
+
+    def test_cycle(self):
+        a, b = self.puzzle("a"), self.puzzle("b")
+        after = self.puzzle("after")
+        self.needs(a, b)
+        self.needs(b, a)
+        self.needs(after, a)
+        graph = self.graph()
+        self.assertEqual(
+            graph.problems,
+            {
+                a.pk: "needs itself through a cycle",
+                b.pk: "needs itself through a cycle",
+                after.pk: "needs a, which never opens",
+            },
+        )
+        self.assertEqual([graph.unlockables[i] for i in graph.cycles[0]], [a, b])
+
+    def test_parent_in_another_hunt(self):
+        elsewhere = PuzzleFactory.create().unlockable
+        u = self.puzzle("u")
+        self.needs(u, elsewhere)
+        self.assertEqual(
+            self.graph().problems, {u.pk: "needs an unlockable from another hunt"}
+        )
+
+    def test_unreachable(self):
+        story = RoundFactory.create(
+            unlockable__hunt=self.hunt, unlockable__slug="story"
+        ).unlockable
+        u = self.puzzle("u")
+        self.needs(u, story)
+        later = self.puzzle("later", unlock_date=self.hunt.end_date + timedelta(1))
+        self.assertEqual(
+            self.graph().problems,
+            {
+                u.pk: "needs story, which is not a puzzle",
+                later.pk: "unlocks after the hunt ends",
+            },
+        )
+
+    def test_insufficient_courage(self):
+        self.puzzle("cheap")
+        dear = self.puzzle("dear", unlock_courage_threshold=25)
+        self.assertEqual(
+            self.graph().problems,
+            {dear.pk: "needs 25 courage, but only 10 can be earned"},
+        )
+
+    def test_forced_visibility_opens_regardless(self):
+        u = self.puzzle("u", unlock_courage_threshold=999, force_visibility=True)
+        self.assertEqual(self.graph().problems, {})
+        self.assertTrue(self.graph().is_unlocked(u, False, 0, (), timezone.now()))
+
+    def test_is_unlocked(self):
+        first = self.puzzle("first")
+        second = self.puzzle(
+            "second",
+            unlock_courage_threshold=10,
+            unlock_date=timezone.now() + timedelta(days=1),
+        )
+        self.needs(second, first)
+        graph = self.graph()
+        now = timezone.now()
+        tomorrow = now + timedelta(days=2)
+        self.assertTrue(graph.is_unlocked(first, False, 0, (), now))
+        # courage, date and what it needs must all be there
+        self.assertTrue(graph.is_unlocked(second, False, 10, {first.pk}, tomorrow))
+        self.assertFalse(graph.is_unlocked(second, False, 9, {first.pk}, tomorrow))
+        self.assertFalse(graph.is_unlocked(second, False, 10, {first.pk}, now))
+        self.assertFalse(graph.is_unlocked(second, False, 10, (), tomorrow))
+        # everything opens once the hunt ends
+        after = self.hunt.end_date + timedelta(1)
+        self.assertTrue(graph.is_unlocked(second, False, 0, (), after))
+
+    def test_hidden_or_unstarted_hunt_is_only_open_to_staff(self):
+        u = self.puzzle("u")
+        for field, value in (
+            ("visible", False),
+            ("start_date", timezone.now() + timedelta(1)),
+        ):
+            with self.subTest(field):
+                hunt = copy(self.hunt)
+                setattr(hunt, field, value)
+                graph = UnlockGraph(hunt, [u])
+                self.assertFalse(graph.is_unlocked(u, False, 0, (), timezone.now()))
+                self.assertTrue(graph.is_unlocked(u, True, 0, (), timezone.now()))
+
+    @override_settings(VERSION_CHECK_SECONDS=0)
+    def test_compiled_graph_is_rebuilt_on_edit(self):
+        u = self.puzzle("u")
+        graph = get_unlock_graph(self.hunt)
+        self.assertIs(get_unlock_graph(self.hunt), graph)
+        self.assertEqual(graph.rules[u.pk].threshold, 0)
+
+        # an edit saved through the models bumps the content version
+        u.unlock_courage_threshold = 5
+        u.save()
+        rebuilt = get_unlock_graph(self.hunt)
+        self.assertIsNot(rebuilt, graph)
+        self.assertEqual(rebuilt.rules[u.pk].threshold, 5)
+        self.assertFalse(rebuilt.is_unlocked(u, False, 0, (), timezone.now()))
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.factories import HuntFactory, PuzzleFactory
+from core.models import Hunt, Unlockable
+from core.progresso import get_bounties
+from core.snapshot import get_catalog
+from core.versions import CONTENT, PAGES, get_version
+from info.context_processors import get_listed_pages
+from info.models import Page
+
+
+def bump_elsewhere(name: str = CONTENT):
+    """What bump_version does in another worker: only the shared cache changes."""
+    cache.set(f"version:{name}", get_version(name) + 1, None)
+
+
+@override_settings(VERSION_CHECK_SECONDS=0)
+class SharedVersionTest(TestCase):
+    def test_bump_in_another_worker_is_seen(self):
+        before = get_version()
+        bump_elsewhere()
+        self.assertEqual(get_version(), before + 1)
+
+    def test_checked_at_most_every_interval(self):
+        before = get_version()
+        with override_settings(VERSION_CHECK_SECONDS=60):
+            bump_elsewhere()
+            self.assertEqual(get_version(), before)
+
+    def test_snapshot_reloads_after_edit_in_another_worker(self):
+        hunt = HuntFactory.create(visible=True)
+        catalog = get_catalog()
+        # saved elsewhere, so no signal fires here
+        Hunt.objects.filter(pk=hunt.pk).update(name="Renamed")
+        self.assertIs(get_catalog(), catalog)
+        bump_elsewhere()
+        self.assertEqual(get_catalog().hunts[hunt.volume_number].name, "Renamed")
+
+    def test_cached_page_reloads_after_edit_in_another_worker(self):
+        hunt = HuntFactory.create(visible=True, name="Before")
+        self.assertContains(self.client.get("/"), "Before")
+        Hunt.objects.filter(pk=hunt.pk).update(name="After")
+        self.assertContains(self.client.get("/"), "Before")
+        bump_elsewhere()
+        self.assertContains(self.client.get("/"), "After")
+
+    def test_navigation_reloads_after_edit_in_another_worker(self):
+        page = Page.objects.create(title="Before", slug="rules", content="")
+        self.assertEqual([p.title for p in get_listed_pages()], ["Before"])
+        Page.objects.filter(pk=page.pk).update(title="After")
+        bump_elsewhere(PAGES)
+        self.assertEqual([p.title for p in get_listed_pages()], ["After"])
+
+    def test_bounties_reload_after_edit_in_another_worker(self):
+        puzzle = PuzzleFactory.create(unlockable__courage_bounty=1)
+        u = puzzle.unlockable
+        self.assertEqual(get_bounties()[u.hunt_id].bounties[u.pk], 1)
+        Unlockable.objects.filter(pk=u.pk).update(courage_bounty=5)
+        bump_elsewhere()
+        self.assertEqual(get_bounties()[u.hunt_id].bounties[u.pk], 5)
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from core.factories import PuzzleFactory, UserFactory
+
+
+class StaffViewPermissionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.puzzle = PuzzleFactory.create()
+        cls.hunt = cls.puzzle.unlockable.hunt
+        cls.staff_urls = [
+            "/staff/hunts",
+            "/staff/puzzles",
+            f"/staff/unlockables/{cls.hunt.volume_number}",
+            f"/staff/unlocks/{cls.hunt.volume_number}",
+            f"/{cls.hunt.volume_number}/puzzle/{cls.puzzle.slug}/edit",
+        ]
+
+    def test_anonymous_is_turned_away(self):
+        for url in self.staff_urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn(response.status_code, (302, 403))
+
+    def test_solver_is_turned_away(self):
+        self.client.force_login(UserFactory.create())
+        for url in self.staff_urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn(response.status_code, (302, 403))
+
+    def test_superuser_sees_staff_views(self):
+        self.client.force_login(UserFactory.create(is_staff=True, is_superuser=True))
+        for url in self.staff_urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,195 @@
+"""What unlocks what in a hunt, compiled once per content version.
+
+Each unlockable waits on at most one other (``unlock_needs``) and on
+a courage threshold and date. Only puzzles are ever solved, and solving
+one pays its ``courage_bounty``. The graph keeps the rules every unlock
+decision needs, plus an analysis for staff: which unlockables sit on a
+cycle, and which can never open during the hunt because what they
+need can't be solved or there isn't enough courage to go around."""
+
+from collections import deque
+from collections.abc import Collection, Sequence
+from datetime import datetime
+from heapq import heappop, heappush
+from typing import NamedTuple
+
+from .models import Hunt, Unlockable
+
+
+class Rule(NamedTuple):
+    threshold: int
+    unlock_date: datetime | None
+    needs: int | None
+    forced: bool
+
+    @classmethod
+    def of(cls, u: Unlockable) -> "Rule":
+        return cls(
+            u.unlock_courage_threshold,
+            u.unlock_date,
+            u.unlock_needs_id,
+            u.force_visibility is True,
+        )
+
+
+class Row(NamedTuple):
+    unlockable: Unlockable
+    courage: int | None
+    problem: str
+
+
+class UnlockGraph:
+    __slots__ = (
+        "courage",
+        "cycles",
+        "dependents",
+        "hunt",
+        "index",
+        "max_courage",
+        "needs",
+        "order",
+        "problems",
+        "rules",
+        "unlockables",
+    )
+
+    def __init__(self, hunt: Hunt, unlockables: Sequence[Unlockable]):
+        self.hunt = hunt
+        self.unlockables = list(unlockables)
+        self.rules = {u.pk: Rule.of(u) for u in self.unlockables}
+        self.index = {u.pk: i for i, u in enumerate(self.unlockables)}
+
+        # adjacency by position: what each one needs, and what needs it
+        self.needs: list[int | None] = [
+            self.index.get(u.unlock_needs_id or 0) for u in self.unlockables
+        ]
+        self.dependents: list[list[int]] = [[] for _ in self.unlockables]
+        for i, j in enumerate(self.needs):
+            if j is not None:
+                self.dependents[j].append(i)
+
+        self.order, self.cycles = self._sort()
+        self.courage, self.max_courage = self._simulate()
+        self.problems = self._diagnose()
+
+    def _sort(self) -> tuple[list[int], list[list[int]]]:
+        """Topological order along unlock_needs, and the cycles left over."""
+        queue = deque(i for i, j in enumerate(self.needs) if j is None)
+        order: list[int] = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            queue.extend(self.dependents[i])
+
+        # every node has at most one edge out, so what's left is
+        # the cycles and whatever hangs off them
+        left = set(range(len(self.unlockables))) - set(order)
+        cycles: list[list[int]] = []
+        seen: set[int] = set()
+        for start in sorted(left):
+            path: list[int] = []
+            i: int | None = start
+            while i is not None and i not in seen:
+                seen.add(i)
+                path.append(i)
+                i = self.needs[i]
+            if i is not None and i in path:
+                cycles.append(path[path.index(i) :])
+        return order, cycles
+
+    def _simulate(self) -> tuple[list[int | None], int]:
+        """Open everything a solver could, cheapest first, solving every
+        puzzle on the way. Returns the courage a solver can have when each
+        unlockable opens (None if it never does) and the most there is."""
+        courage_at: list[int | None] = [None] * len(self.unlockables)
+        heap: list[tuple[int, int]] = []
+        for i, u in enumerate(self.unlockables):
+            rule = self.rules[u.pk]
+            if rule.forced:
+                heappush(heap, (0, i))
+            elif rule.needs is None:
+                heappush(heap, (rule.threshold, i))
+
+        courage = 0
+        while heap and heap[0][0] <= courage:
+            _, i = heappop(heap)
+            if courage_at[i] is not None:
+                continue
+            courage_at[i] = courage
+            u = self.unlockables[i]
+            if u.is_puzzle:
+                courage += u.courage_bounty
+                for d in self.dependents[i]:
+                    rule = self.rules[self.unlockables[d].pk]
+                    if not rule.forced:
+                        heappush(heap, (rule.threshold, d))
+        return courage_at, courage
+
+    def _diagnose(self) -> dict[int, str]:
+        """Why each unlockable that never opens doesn't, by pk."""
+        on_cycle = {i for cycle in self.cycles for i in cycle}
+        problems: dict[int, str] = {}
+        for i, u in enumerate(self.unlockables):
+            rule = self.rules[u.pk]
+            if u.unlock_date is not None and u.unlock_date > self.hunt.end_date:
+                problems[u.pk] = "unlocks after the hunt ends"
+            if self.courage[i] is not None:
+                continue
+            j = self.needs[i]
+            if i in on_cycle:
+                problems[u.pk] = "needs itself through a cycle"
+            elif rule.needs is not None and j is None:
+                problems[u.pk] = "needs an unlockable from another hunt"
+            elif j is not None and not self.unlockables[j].is_puzzle:
+                problems[u.pk] = (
+                    f"needs {self.unlockables[j].slug}, which is not a puzzle"
+                )
+            elif j is not None and self.courage[j] is None:
+                problems[u.pk] = f"needs {self.unlockables[j].slug}, which never opens"
+            else:
+                problems[u.pk] = (
+                    f"needs {rule.threshold} courage, "
+                    f"but only {self.max_courage} can be earned"
+                )
+        return problems
+
+    def rows(self) -> list[Row]:
+        """Every unlockable in topological order, then those on cycles."""
+        sorted_ = set(self.order)
+        ordered = self.order + [
+            i for i in range(len(self.unlockables)) if i not in sorted_
+        ]
+        return [
+            Row(
+                self.unlockables[i],
+                self.courage[i],
+                self.problems.get(self.unlockables[i].pk, ""),
+            )
+            for i in ordered
+        ]
+
+    def is_unlocked(
+        self,
+        u: Unlockable,
+        staff: bool,
+        courage: int,
+        solved_pks: Collection[int],
+        now: datetime,
+    ) -> bool:
+        hunt = self.hunt
+        if not hunt.visible and not staff:
+            return False
+        elif hunt.end_date < now:
+            return True
+        elif not hunt.start_date < now and not staff:
+            return False
+
+        # created since the graph was compiled
+        rule = self.rules.get(u.pk) or Rule.of(u)
+        if rule.forced:
+            return True
+        if courage < rule.threshold:
+            return False
+        if rule.unlock_date is not None and now < rule.unlock_date:
+            return False
+        return rule.needs is None or rule.needs in solved_pks
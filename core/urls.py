@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
@@ -56,11 +57,21 @@ urlpatterns = [
         views.StaffUnlockableList.as_view(),
         name="staff-unlockable-list",
     ),
+    path(
+        r"staff/unlocks/<str:volume_number>",
+        views.StaffUnlockGraph.as_view(),
+        name="staff-unlock-graph",
+    ),
+    path(r"staff/stats", views.staff_stats, name="staff-stats"),
     # -- other --
     path(
         r"<str:hunt__volume_number>/unlock/<str:slug>",
         views.UnlockableDetail.as_view(),
         name="unlockable-detail",
     ),
-    path(r"ajax", views.ajax, name="ajax"),
+    path(
+        r"ajax",
+        views.ajax_async if settings.ASYNC_AJAX else views.ajax,
+        name="ajax",
+    ),
 ]
@@ -12,6 +12,27 @@ def sha(s: str) -> str:
     return sha256(("MOSP_LIGHT_NOVEL_" + s).encode("UTF-8")).hexdigest()
 
 
+def tree_paths(
+    parents: dict[int, int | None], round_unlockables: dict[int, int | None]
+) -> dict[int, str]:
+    """The tree_path of every unlockable, given the parent round of each
+    unlockable and the unlockable of each round: the pks of the rounds
+    above it, top first, each followed by a slash. Loops are cut."""
+    paths: dict[int, str] = {}
+    for pk, parent in parents.items():
+        chain: list[int] = []
+        seen = {pk}
+        while parent is not None:
+            chain.append(parent)
+            above = round_unlockables.get(parent)
+            if above is None or above in seen:
+                break
+            seen.add(above)
+            parent = parents.get(above)
+        paths[pk] = "".join(f"{r}/" for r in reversed(chain))
+    return paths
+
+
 def is_staff(user: AbstractBaseUser | AnonymousUser) -> bool:
     if not isinstance(user, User):
         return False
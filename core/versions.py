@@ -0,0 +1,75 @@
+"""Version counters kept in Django's cache, which every worker shares
+(see CACHES in the settings).
+
+Each worker holds in-memory copies of puzzle content tagged with the
+version they were built from; bumping the version on save tells every
+worker that its copies are stale. Workers read the counters at most
+every VERSION_CHECK_SECONDS, so an edit reaches the other workers
+within that long, and the worker that made it at once."""
+
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .instrumentation import warming_up
+
+CONTENT = "content"
+PAGES = "pages"
+NAMES = (CONTENT, PAGES)
+
+_lock = threading.Lock()
+_versions: dict[str, int] = {}
+_checked = float("-inf")
+
+
+def _key(name: str) -> str:
+    return f"version:{name}"
+
+
+def _is_stale() -> bool:
+    return time.monotonic() - _checked >= getattr(settings, "VERSION_CHECK_SECONDS", 1)
+
+
+def _refresh():
+    global _checked
+    with _lock:
+        if not _is_stale():
+            return
+        # a query with the database cache, but once a second, not per request
+        with warming_up():
+            found = cache.get_many([_key(name) for name in NAMES])
+            for name in NAMES:
+                version = found.get(_key(name))
+                if version is None:
+                    # start from the clock so a flushed cache never reuses
+                    # an old version
+                    version = time.time_ns()
+                    if not cache.add(_key(name), version, None):
+                        version = cache.get(_key(name), version)
+                _versions[name] = version
+        _checked = time.monotonic()
+
+
+def get_version(name: str = CONTENT) -> int:
+    if _is_stale():
+        _refresh()
+    return _versions[name]
+
+
+async def aget_version(name: str = CONTENT) -> int:
+    """get_version for async code, only going to a thread to read the cache."""
+    if _is_stale():
+        await sync_to_async(_refresh)()
+    return _versions[name]
+
+
+def bump_version(name: str = CONTENT) -> int:
+    # a fresh value rather than incr(), which the database cache
+    # does as a read and a write that two edits could interleave
+    version = max(time.time_ns(), _versions.get(name, 0) + 1)
+    cache.set(_key(name), version, None)
+    _versions[name] = version
+    return version
@@ -1,14 +1,17 @@
+import time
 from typing import Any, Dict
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count
+from django.db.models import Exists, F, OuterRef, Subquery
 from django.db.models.query import QuerySet
 from django.forms.models import BaseModelForm
 from django.http import HttpRequest, JsonResponse  # NOQA
 from django.http.response import HttpResponseBase
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import DetailView, ListView
 from django.views.generic.detail import SingleObjectMixin
@@ -16,14 +19,27 @@ from django.views.generic.edit import UpdateView
 
 from core.progresso import (
     check_unlocked,
-    get_solved_pks,
+    get_unlock_states,
+    has_solved,
     mark_opened,
     mark_solved,
     set_courage,
 )
 
+from .conditional import conditional_dispatch
+from .instrumentation import rolling_summary
+from .logs import log_guess
 from .models import Hunt, Puzzle, Round, SaltedAnswer, Solution, Unlockable  # NOQA
-from .utils import is_staff
+from .page_cache import PageCacheMixin, page_cache
+from .rendering import markdown_cache
+from .snapshot import (
+    aget_hunt_snapshot,
+    aget_puzzle,
+    get_catalog,
+    get_chapter,
+    get_hunt_snapshot,
+)
+from .utils import is_staff, normalize, sha
 
 
 class StaffRequiredMixin(PermissionRequiredMixin):
@@ -45,17 +61,19 @@ class GeneralizedSingleObjectMixin(SingleObjectMixin[Any]):
 Context = Dict[str, Any]
 
 
-class HuntList(ListView[Hunt]):
+class HuntList(PageCacheMixin, ListView[Hunt]):
     """Top-level list of all the hunts"""
 
     context_object_name = "hunt_list"
     model = Hunt
+    template_name = "core/hunt_list.html"
 
-    def get_queryset(self):
-        return Hunt.objects.filter(visible=True)
+    def get_queryset(self) -> list[Hunt]:
+        return [h for h in get_catalog().hunts.values() if h.visible]
 
 
-class RoundUnlockableList(ListView[Unlockable]):
+@conditional_dispatch
+class RoundUnlockableList(PageCacheMixin, ListView[Unlockable]):
     """List of all the top-level rounds in a given hunt"""
 
     context_object_name = "round_unlockable_list"
@@ -65,57 +83,71 @@ class RoundUnlockableList(ListView[Unlockable]):
     def get_context_data(self, **kwargs: Any):
         context = super().get_context_data(**kwargs)
         context["hunt"] = self.hunt
+        unlockables = context["round_unlockable_list"]
+        states = get_unlock_states(self.request, self.hunt, unlockables)
+        context["round_unlockable_rows"] = [(u, states[u.pk]) for u in unlockables]
         return context
 
     def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any):
         set_courage(request)
-        self.hunt = Hunt.objects.get(volume_number=self.kwargs["volume_number"])
+        self.snapshot = get_hunt_snapshot(self.kwargs["volume_number"])
+        self.hunt = self.snapshot.hunt
         if not self.hunt.has_started and not is_staff(request.user):
             return render(request, "core/too_early.html", {"hunt": self.hunt})
         return super().dispatch(request, *args, **kwargs)
 
-    def get_queryset(self) -> QuerySet[Unlockable]:
-        return Unlockable.objects.filter(
-            hunt=self.hunt, parent__isnull=True
-        ).select_related("round")
+    def get_queryset(self) -> list[Unlockable]:
+        return self.snapshot.top_level()
 
 
-class UnlockableList(ListView[Unlockable]):
+@conditional_dispatch
+class UnlockableList(PageCacheMixin, ListView[Unlockable]):
     """List of all the unlockables in a given round"""
 
     context_object_name = "unlockable_list"
     model = Unlockable
+    template_name = "core/unlockable_list.html"
     object: Unlockable
 
     def dispatch(
         self, request: HttpRequest, *args: Any, **kwargs: Any
     ) -> HttpResponseBase:
         set_courage(request)
-        self.round = Round.objects.get(**self.kwargs)
+        self.snapshot, self.round = get_chapter(self.kwargs["chapter_number"])
         assert self.round.unlockable is not None
-        self.hunt = self.round.unlockable.hunt
+        self.hunt = self.snapshot.hunt
         if not check_unlocked(request, self.round.unlockable):
             raise PermissionDenied("Not unlocked yet")
         mark_opened(request, self.round.unlockable)
         return super().dispatch(request, *args, **kwargs)
 
-    def get_queryset(self) -> QuerySet[Unlockable]:
-        queryset = Unlockable.objects.filter(parent=self.round)
-        queryset = queryset.annotate(round_exists=Count("round"))
-        queryset = queryset.order_by(
-            "sort_order",
-            "name",
-        )
-        queryset = queryset.select_related("puzzle", "round")
-        return queryset
+    def get_queryset(self) -> list[Unlockable]:
+        return self.snapshot.children(self.round)
 
     def get_context_data(self, **kwargs: Any) -> Context:
         context = super().get_context_data(**kwargs)
         context["round"] = self.round
+        context["hunt"] = self.hunt
+        unlockables = context["unlockable_list"]
+        states = get_unlock_states(self.request, self.hunt, unlockables)
+        context["unlockable_rows"] = [(u, states[u.pk]) for u in unlockables]
         return context
 
 
-class PuzzleDetail(DetailView[Puzzle]):
+class SnapshotPuzzleMixin(SingleObjectMixin[Puzzle]):
+    """Looks up the puzzle in the hunt snapshot instead of the database"""
+
+    def get_object(self, queryset: QuerySet[Puzzle] | None = None) -> Puzzle:
+        kwargs = self.kwargs  # type: ignore
+        snapshot = get_hunt_snapshot(kwargs["unlockable__hunt__volume_number"])
+        return snapshot.get_puzzle(kwargs["slug"])
+
+    def get_page_hunt(self) -> Hunt:
+        return self.object.unlockable.hunt
+
+
+@conditional_dispatch
+class PuzzleDetail(PageCacheMixin, SnapshotPuzzleMixin, DetailView[Puzzle]):
     """Shows a puzzle"""
 
     model = Puzzle
@@ -136,8 +168,14 @@ class PuzzleDetail(DetailView[Puzzle]):
             mark_opened(request, self.object.unlockable)
         return ret
 
+    def get_context_data(self, **kwargs: Any) -> Context:
+        context = super().get_context_data(**kwargs)
+        context["fast_grading"] = settings.FAST_GRADING
+        return context
+
 
-class PuzzleSolutionDetail(DetailView[Puzzle]):
+@conditional_dispatch
+class PuzzleSolutionDetail(PageCacheMixin, SnapshotPuzzleMixin, DetailView[Puzzle]):
     """Shows a solution"""
 
     model = Puzzle
@@ -158,7 +196,7 @@ class PuzzleSolutionDetail(DetailView[Puzzle]):
                 )
             else:
                 raise PermissionDenied("This puzzle cannot be unlocked yet")
-        if u.hunt.active and self.object.unlockable.pk not in get_solved_pks(request):
+        if u.hunt.active and not has_solved(request, u):
             if is_staff(request.user):
                 messages.warning(
                     request, "Viewing as staff. You haven't solved this yet."
@@ -168,11 +206,19 @@ class PuzzleSolutionDetail(DetailView[Puzzle]):
         return ret
 
 
-class UnlockableDetail(DetailView[Unlockable]):
+@conditional_dispatch
+class UnlockableDetail(PageCacheMixin, DetailView[Unlockable]):
     model = Unlockable
     context_object_name = "unlockable"
     object: Unlockable
 
+    def get_object(self, queryset: QuerySet[Unlockable] | None = None) -> Unlockable:
+        snapshot = get_hunt_snapshot(self.kwargs["hunt__volume_number"])
+        return snapshot.get_unlockable(self.kwargs["slug"])
+
+    def get_page_hunt(self) -> Hunt:
+        return self.object.hunt
+
     def get_context_data(self, **kwargs: Any) -> Context:
         context = super().get_context_data(**kwargs)
         context["locked"] = not check_unlocked(self.request, self.object)
@@ -189,34 +235,63 @@ class UnlockableDetail(DetailView[Unlockable]):
         return ret
 
 
+def graded(puzzle: Puzzle, sa: SaltedAnswer | None) -> JsonResponse:
+    """Response to a guess that matched `sa`, or nothing if `sa` is None"""
+    if sa is None:
+        return JsonResponse({"correct": 0})
+    elif sa.is_correct:
+        return JsonResponse(
+            {
+                "correct": 1,
+                "url": puzzle.get_solution_url(),
+            }
+        )
+    else:
+        return JsonResponse({"correct": 0.5, "message": sa.message})
+
+
+def grade(
+    request: HttpRequest, puzzle: Puzzle, sa: SaltedAnswer | None
+) -> JsonResponse:
+    if sa is not None and sa.is_correct:
+        mark_solved(request, puzzle.unlockable)
+    return graded(puzzle, sa)
+
+
 @csrf_exempt
 def ajax(request: HttpRequest) -> JsonResponse:
     if request.method != "POST":
         return JsonResponse({"error": "☕"}, status=418)
 
+    started = time.perf_counter()
     action = request.POST.get("action")
-    print(action)
     if action == "guess":
-        puzzle = Puzzle.objects.get(slug=request.POST.get("puzzle_slug"))
+        puzzle = get_object_or_404(
+            Puzzle.objects.select_related("unlockable__hunt"),
+            slug=request.POST.get("puzzle_slug"),
+        )
         guess = request.POST.get("guess") or ""
-        salt = int(request.POST.get("salt") or 0)
-        sa = SaltedAnswer.objects.get(puzzle=puzzle, salt=salt)
-        print(sa)
-        print(guess)
-        print(request.session["solved"])
-        if not sa.equals(guess):
-            return JsonResponse({"correct": 0})
-        elif sa.is_correct:
-            mark_solved(request, puzzle.unlockable)
-            print(request.session)
-            return JsonResponse(
-                {
-                    "correct": 1,
-                    "url": puzzle.get_solution_url(),
-                }
-            )
+        if digest := request.POST.get("hash"):
+            # the hash the browser matched, which the index finds directly
+            sa = SaltedAnswer.objects.filter(puzzle=puzzle, hash=digest).first()
         else:
-            return JsonResponse({"correct": 0.5, "message": sa.message})
+            salt = int(request.POST.get("salt") or 0)
+            sa = SaltedAnswer.objects.filter(puzzle=puzzle, salt=salt).first()
+        # hashes are public, so the guess itself still has to match
+        if sa is not None and not sa.equals(guess):
+            sa = None
+        response = grade(request, puzzle, sa)
+        log_guess(request, action, puzzle, sa, started)
+        return response
+
+    elif action == "check":
+        # fast grading: no salt search in the browser, just compare normalized answers
+        snapshot = get_hunt_snapshot(request.POST.get("volume_number") or "")
+        puzzle = snapshot.get_puzzle(request.POST.get("puzzle_slug") or "")
+        sa = snapshot.check_answer(puzzle, request.POST.get("guess") or "")
+        response = grade(request, puzzle, sa)
+        log_guess(request, action, puzzle, sa, started)
+        return response
 
     elif action == "set_name":
         if not request.POST["name"]:
@@ -227,16 +302,63 @@ def ajax(request: HttpRequest) -> JsonResponse:
     return JsonResponse({"message": f"No such method {action}"}, status=400)
 
 
+async def agrade(
+    request: HttpRequest, puzzle: Puzzle, sa: SaltedAnswer | None
+) -> JsonResponse:
+    if sa is not None and sa.is_correct:
+        # old sessions are converted with a query
+        await sync_to_async(mark_solved)(request, puzzle.unlockable)
+    return graded(puzzle, sa)
+
+
+@csrf_exempt
+async def ajax_async(request: HttpRequest) -> JsonResponse:
+    """`ajax` for ASGI servers. Guesses are graded against the snapshot,
+    so a burst of them after an unlock doesn't queue on the database thread."""
+    if request.method != "POST":
+        return JsonResponse({"error": "☕"}, status=418)
+
+    started = time.perf_counter()
+    action = request.POST.get("action")
+    if action == "guess":
+        snapshot, puzzle = await aget_puzzle(request.POST.get("puzzle_slug") or "")
+        guess = request.POST.get("guess") or ""
+        if not (digest := request.POST.get("hash") or ""):
+            digest = sha(normalize(guess) + str(int(request.POST.get("salt") or 0)))
+        sa = snapshot.match_hash(puzzle, digest)
+        # hashes are public, so the guess itself still has to match
+        if sa is not None and not sa.equals(guess):
+            sa = None
+        response = await agrade(request, puzzle, sa)
+        log_guess(request, action, puzzle, sa, started)
+        return response
+
+    elif action == "check":
+        snapshot = await aget_hunt_snapshot(request.POST.get("volume_number") or "")
+        puzzle = snapshot.get_puzzle(request.POST.get("puzzle_slug") or "")
+        sa = snapshot.check_answer(puzzle, request.POST.get("guess") or "")
+        response = await agrade(request, puzzle, sa)
+        log_guess(request, action, puzzle, sa, started)
+        return response
+
+    elif action == "set_name":
+        if not request.POST["name"]:
+            raise PermissionDenied("Name can't be blank")
+        await request.session.aset("name", request.POST["name"])
+        return JsonResponse({"success": 1})
+
+    return JsonResponse({"message": f"No such method {action}"}, status=400)
+
+
 # -- Staff views --
 
 
-class PuzzleUpdate(UpdateView[Puzzle, BaseModelForm[Puzzle]], StaffRequiredMixin):
+class PuzzleUpdate(StaffRequiredMixin, UpdateView[Puzzle, BaseModelForm[Puzzle]]):
     model = Puzzle
     context_object_name = "puzzle"
     fields = (
         "name",
         "slug",
-        "status_progress",
         "flavor_text",
         "content",
         "puzzle_head",
@@ -244,8 +366,8 @@ class PuzzleUpdate(UpdateView[Puzzle, BaseModelForm[Puzzle]], StaffRequiredMixin
 
 
 class SolutionUpdate(
-    UpdateView[Solution, BaseModelForm[Solution]],
     StaffRequiredMixin,
+    UpdateView[Solution, BaseModelForm[Solution]],
     GeneralizedSingleObjectMixin,
 ):
     model = Solution
@@ -260,8 +382,8 @@ class SolutionUpdate(
 
 
 class RoundUpdate(
-    UpdateView[Round, BaseModelForm[Round]],
     StaffRequiredMixin,
+    UpdateView[Round, BaseModelForm[Round]],
     GeneralizedSingleObjectMixin,
 ):
     model = Round
@@ -277,8 +399,8 @@ class RoundUpdate(
 
 
 class UnlockableUpdate(
-    UpdateView[Unlockable, BaseModelForm[Unlockable]],
     StaffRequiredMixin,
+    UpdateView[Unlockable, BaseModelForm[Unlockable]],
     GeneralizedSingleObjectMixin,
 ):
     model = Unlockable
@@ -293,7 +415,7 @@ class UnlockableUpdate(
     )
 
 
-class StaffHuntList(ListView[Hunt], StaffRequiredMixin):
+class StaffHuntList(StaffRequiredMixin, ListView[Hunt]):
     """Staff view of all the hunts"""
 
     context_object_name = "hunt_list"
@@ -304,33 +426,90 @@ class StaffHuntList(ListView[Hunt], StaffRequiredMixin):
         return Hunt.objects.order_by("-start_date")
 
 
-class StaffPuzzleList(ListView[Puzzle], StaffRequiredMixin):
+class StaffPuzzleList(StaffRequiredMixin, ListView[Puzzle]):
     """Staff list of the puzzles"""
 
     context_object_name = "puzzle_list"
     model = Puzzle
     template_name = "core/staff_puzzle_list.html"
+    paginate_by = 100
 
     def get_queryset(self):
         return (
-            Puzzle.objects.filter(status_progress__range=(0, 6))
-            .order_by("status_progress")
-            .select_related("unlockable", "solution")
+            Puzzle.objects.select_related("unlockable__hunt")
+            .annotate(
+                has_solution=Exists(Solution.objects.filter(puzzle=OuterRef("pk"))),
+                canonical_answer=Subquery(
+                    SaltedAnswer.objects.filter(
+                        puzzle=OuterRef("pk"), is_canonical=True
+                    ).values("display_answer")[:1]
+                ),
+            )
+            .order_by(
+                F("unlockable__hunt__start_date").desc(nulls_first=True),
+                "unlockable__sort_order",
+                "name",
+            )
         )
 
 
-class StaffUnlockableList(ListView[Unlockable], StaffRequiredMixin):
+class StaffUnlockableList(StaffRequiredMixin, ListView[Unlockable]):
     """Staff list of unlockables"""
 
     context_object_name = "unlockable_list"
     model = Unlockable
     template_name = "core/staff_unlockable_list.html"
+    paginate_by = 100
 
     def get_queryset(self):
-        self.hunt = Hunt.objects.get(**self.kwargs)
-        return Unlockable.objects.filter(hunt=self.hunt).order_by("sort_order")
+        self.hunt = get_object_or_404(Hunt, **self.kwargs)
+        return (
+            Unlockable.objects.filter(hunt=self.hunt)
+            .select_related("hunt", "puzzle", "round", "unlock_needs")
+            .annotate(
+                has_solution=Exists(
+                    Solution.objects.filter(puzzle__unlockable=OuterRef("pk"))
+                ),
+                canonical_answer=Subquery(
+                    SaltedAnswer.objects.filter(
+                        puzzle__unlockable=OuterRef("pk"), is_canonical=True
+                    ).values("display_answer")[:1]
+                ),
+            )
+            .order_by("sort_order", "name")
+        )
 
     def get_context_data(self, **kwargs: Any) -> Context:
         context = super().get_context_data(**kwargs)
         context["hunt"] = self.hunt
         return context
+
+
+class StaffUnlockGraph(StaffRequiredMixin, DetailView[Hunt]):
+    """Staff report of what unlocks what, flagging what never can"""
+
+    context_object_name = "hunt"
+    template_name = "core/staff_unlock_graph.html"
+
+    def get_object(self, queryset: QuerySet[Hunt] | None = None) -> Hunt:
+        self.snapshot = get_hunt_snapshot(self.kwargs["volume_number"])
+        return self.snapshot.hunt
+
+    def get_context_data(self, **kwargs: Any) -> Context:
+        context = super().get_context_data(**kwargs)
+        context["graph"] = self.snapshot.graph
+        context["rows"] = self.snapshot.graph.rows()
+        return context
+
+
+def staff_stats(request: HttpRequest) -> JsonResponse:
+    """Cache counters and per-view timings for monitoring"""
+    if not is_staff(request.user):
+        raise PermissionDenied("Staff only")
+    return JsonResponse(
+        {
+            "mkd": markdown_cache.stats(),
+            "pages": page_cache.stats(),
+            "views": rolling_summary.summary(),
+        }
+    )
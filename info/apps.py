@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InfoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "info"
+
+    def ready(self):
+        from . import signals  # NOQA
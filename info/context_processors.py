@@ -2,8 +2,25 @@ from typing import Any, Dict
 
 from django.http.request import HttpRequest
 
+from core.instrumentation import warming_up
+from core.versions import PAGES, get_version
+
 from .models import Page
 
+_listed: tuple[int, list[Page]] | None = None
+
+
+def get_listed_pages() -> list[Page]:
+    """The pages in the navigation, kept in memory
+    until a page is saved or deleted (see info.signals)."""
+    global _listed
+    version = get_version(PAGES)
+    if _listed is None or _listed[0] != version:
+        with warming_up():
+            pages = list(Page.objects.filter(listed=True).only("title", "slug"))
+        _listed = (version, pages)
+    return _listed[1]
+
 
 def pages(request: HttpRequest) -> Dict[str, Any]:
-    return {"pages": Page.objects.filter(listed=True)}
+    return {"pages": get_listed_pages()}
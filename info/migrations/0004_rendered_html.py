@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:35
+
+from typing import ClassVar
+
+from django.db import migrations, models
+
+from core.rendering import MARKDOWN_CONFIG_VERSION, convert_to_markdown
+
+MARKDOWN_FIELDS = {
+    "page": ("content",),
+}
+
+
+def render_html(apps, schema_editor):
+    for model_name, fields in MARKDOWN_FIELDS.items():
+        model = apps.get_model("info", model_name)
+        objs = list(model.objects.all())
+        for obj in objs:
+            for f in fields:
+                setattr(obj, f + "_html", convert_to_markdown(getattr(obj, f)))
+            obj.rendered_version = MARKDOWN_CONFIG_VERSION
+        model.objects.bulk_update(
+            objs, [f + "_html" for f in fields] + ["rendered_version"], batch_size=100
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ("info", "0003_alter_page_content"),
+    ]
+
+    operations: ClassVar[list[migrations.operations.base.Operation]] = [
+        migrations.AddField(
+            model_name="page",
+            name="content_html",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Rendered HTML of content"
+            ),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="rendered_version",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Markdown config the HTML columns were rendered with",
+                max_length=12,
+            ),
+        ),
+        migrations.RunPython(render_html, migrations.RunPython.noop),
+    ]
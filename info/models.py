@@ -2,12 +2,19 @@ from django.db import models
 from django.urls import reverse
 from markdownx.models import MarkdownxField
 
+from core.rendering import MarkdownRenderedModel
+
 # Create your models here.
 
 
-class Page(models.Model):
+class Page(MarkdownRenderedModel):
+    markdown_fields = ("content",)
+
     title = models.CharField(max_length=255, help_text="Title of the page")
     content = MarkdownxField(help_text="Markdown content for the page")
+    content_html = models.TextField(
+        help_text="Rendered HTML of content", blank=True, editable=False
+    )
     slug = models.SlugField(unique=True, help_text="The slug for the page")
     published = models.BooleanField(
         help_text="Whether this page is published.", default=True
@@ -0,0 +1,14 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.versions import PAGES, bump_version
+
+from .models import Page
+
+
+@receiver(post_save, sender=Page, dispatch_uid="bump_pages_version_on_save")
+@receiver(post_delete, sender=Page, dispatch_uid="bump_pages_version_on_delete")
+def bump_pages_version(sender: type[Page], **kwargs: Any):
+    bump_version(PAGES)
@@ -6,10 +6,13 @@ from django.http.request import HttpRequest
 from django.http.response import HttpResponseBase
 from django.views.generic import DetailView, UpdateView
 
+from core.conditional import conditional_dispatch
+
 from .models import Page
 
 
 # Create your views here.
+@conditional_dispatch
 class PageDetailView(DetailView[Page]):
     model = Page
     context_object_name = "page"
@@ -80,11 +80,13 @@ MARKDOWNX_MARKDOWN_EXTENSIONS = [
     "markdown.extensions.smarty",
 ]
 MIDDLEWARE = [
+    "core.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.routers.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -112,9 +114,58 @@ WSGI_APPLICATION = "mospweb.wsgi.application"
 
 SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
 
+# Shared by every worker: core/versions.py keeps the content versions
+# here, so an edit handled by one worker reaches the others. The table
+# is created by a core migration.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    }
+}
+# How stale a worker's idea of the content version may get
+VERSION_CHECK_SECONDS = 1
+
+# Check guesses on the server instead of making the browser search salts;
+# the salt search is still used if the server check fails
+FAST_GRADING = True
+
+# Serve /ajax with the async view; asgi.py turns this on
+ASYNC_AJAX = bool(os.getenv("ASYNC_AJAX"))
+
+# Share of wrong and partial guesses written to the core.guesses log;
+# solves are always written
+GUESS_LOG_SAMPLE_RATE = 1.0 if DEBUG else 0.1
+
+# Per-view query counts and timings, see core/instrumentation.py;
+# requests running more queries than their budget are logged,
+# or fail outright under test
+SERVER_TIMING = DEBUG
+QUERY_BUDGETS = {
+    "hunt-list": 1,
+    "round-unlockable-list": 1,
+    "unlockable-list": 1,
+    "puzzle-detail": 1,
+    "solution-detail": 1,
+    "unlockable-detail": 1,
+    "page-detail": 3,
+    "ajax": 4,
+    "core_hunt_changelist": 4,
+    "core_round_changelist": 5,
+    "core_unlockable_changelist": 6,
+    "core_puzzle_changelist": 5,
+    "core_solution_changelist": 4,
+    "core_saltedanswer_changelist": 4,
+}
+QUERY_BUDGET_STRICT = TESTING
+
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Seconds a connection is kept open for the next request; 0 closes it
+# after every request. Reused connections are checked first.
+DATABASE_CONN_MAX_AGE = int(os.getenv("DATABASE_CONN_MAX_AGE", "600"))
+
 if os.getenv("DATABASE_NAME"):
     DATABASES: Dict[str, Any] = {
         "default": {
@@ -128,6 +179,8 @@ if os.getenv("DATABASE_NAME"):
                 "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
                 "charset": "utf8mb4",
             },
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
         },
     }
 else:
@@ -135,9 +188,39 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
         }
     }
 
+# Solver reads go to a replica if there is one, see core/routers.py.
+# Locally, SQLITE_REPLICA=1 adds a second file that sync_replica fills,
+# and tests always get one, for core/tests/test_routers.py.
+if os.getenv("DATABASE_NAME"):
+    if os.getenv("DATABASE_REPLICA_HOST"):
+        DATABASES["replica"] = dict(
+            DATABASES["default"],
+            HOST=os.getenv("DATABASE_REPLICA_HOST"),
+            TEST={"MIRROR": "default"},
+        )
+elif os.getenv("SQLITE_REPLICA") or TESTING:
+    DATABASES["replica"] = dict(
+        DATABASES["default"], NAME=BASE_DIR / "db.replica.sqlite3"
+    )
+# Tests read from the primary unless they ask for the replica
+READ_REPLICA = "replica" in DATABASES and not TESTING
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+# Set on every new SQLite connection by core/signals.py: readers don't
+# wait on writers, commits skip the fsync WAL doesn't need, and pages
+# are read through a 256 MiB map and kept in a 32 MiB cache
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -32 * 1024,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -227,6 +310,9 @@ LOGGING = {
             "format": "[{levelname}] {asctime} {module} {name}\n{message}\n",
             "style": "{",
         },
+        "json": {
+            "()": "core.logs.JsonFormatter",
+        },
     },
     "filters": {
         "filter_useless_404": {
@@ -250,16 +336,38 @@ LOGGING = {
         "discord": {
             "class": "evans_django_tools.DiscordWebhookHandler",
             "level": "VERBOSE",
+        },
+        # posts to the webhook from the listener's thread, in batches;
+        # the filters run here since queued records lose their args.
+        # dictConfig takes "handlers" and "listener" from Python 3.12,
+        # below what pyproject.toml requires
+        "discord_queue": {
+            "class": "logging.handlers.QueueHandler",
+            "handlers": ["discord"],
+            "listener": "core.logs.BatchingQueueListener",
+            "respect_handler_level": True,
+            "level": "VERBOSE",
             "filters": ["require_debug_false", "filter_useless_404"],
         },
+        "guess_stream": {
+            "class": "logging.StreamHandler",
+            "level": "INFO",
+            "formatter": "json",
+        },
+        # written from the listener's thread, not the request's
+        "guesses": {
+            "class": "logging.handlers.QueueHandler",
+            "handlers": ["guess_stream"],
+            "respect_handler_level": True,
+        },
     },
     "root": {
-        "handlers": ["console", "discord"],
+        "handlers": ["console", "discord_queue"],
         "level": "INFO",
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "discord"],
+            "handlers": ["console", "discord_queue"],
             "level": "INFO",
             "propagate": False,
         },
@@ -268,6 +376,11 @@ LOGGING = {
             "level": "DEBUG",
             "filters": ["require_debug_true"],
         },
+        "core.guesses": {
+            "handlers": ["guesses"],
+            "level": "INFO",
+            "propagate": False,
+        },
         "django.server": {
             "handlers": ["console"],
             "level": "DEBUG",
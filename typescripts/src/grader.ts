@@ -3,7 +3,14 @@ import Swal from "sweetalert2";
 import err from "./ajaxCrash";
 
 declare const puzzle_slug: string;
+declare const volume_number: string;
+declare const fast_grading: boolean;
 declare const hashes: [hash: string];
+// only on pages exported by the export_static command,
+// which have no server to send guesses to
+declare const static_answers: {
+  [hash: string]: { correct: boolean; message: string; url: string };
+};
 
 const audio = new Audio(
   "https://github.com/vEnhance/dotfiles/blob/main/noisemaker/S3-fanfare.mp3?raw=true",
@@ -27,19 +34,74 @@ $(function () {
       $("#thinking").show();
       $("#percent").css("visibility", "visible");
       $("#answer").prop("disabled", true);
-      guessSalt(0);
+      if (typeof fast_grading !== "undefined" && fast_grading) {
+        checkOnServer();
+      } else {
+        guessSalt(0);
+      }
     }
   }
 
-  async function guessSalt(t: number) {
-    $("#percent").html(t + "%");
-    const answer: string = String($("#answer").val())
+  function normalizedAnswer() {
+    return String($("#answer").val())
       .toUpperCase()
       .replace(/[^A-Z]/g, "");
+  }
+
+  function handleResult(result: any) {
+    if (!result || !result.correct) {
+      err();
+    } else if (result.correct == 1) {
+      target_url = result.url;
+    } else if (result.correct > 0) {
+      Swal.fire({
+        title: "Stay determined...",
+        text: result.message,
+        icon: "success",
+      });
+    } else {
+      err();
+    }
+  }
+
+  // Let the server compare the answer directly;
+  // if that fails for any reason, fall back to searching salts.
+  function checkOnServer() {
+    $.ajax({
+      url: "/ajax",
+      method: "POST",
+      data: {
+        action: "check",
+        guess: normalizedAnswer(),
+        puzzle_slug: puzzle_slug,
+        volume_number: volume_number,
+      },
+      dataType: "json",
+      global: false,
+    })
+      .done((result) => {
+        if (result && result.correct) {
+          handleResult(result);
+        }
+        judge();
+      })
+      .fail(() => guessSalt(0));
+  }
+
+  async function guessSalt(t: number) {
+    $("#percent").html(t + "%");
+    const answer: string = normalizedAnswer();
     for (let i = 111 * t; i < 111 * (t + 1); i++) {
       const g = "MOSP_LIGHT_NOVEL_" + answer + i;
       const hash = await SHA(g);
-      if (hashes.includes(hash)) {
+      if (hashes.includes(hash) && typeof static_answers !== "undefined") {
+        const found = static_answers[hash];
+        handleResult({
+          correct: found.correct ? 1 : 0.5,
+          message: found.message,
+          url: found.url,
+        });
+      } else if (hashes.includes(hash)) {
         waiting_for_ajax = true;
         $.post(
           "/ajax",
@@ -47,22 +109,11 @@ $(function () {
             action: "guess",
             guess: answer,
             salt: i,
+            hash: hash,
             puzzle_slug: puzzle_slug,
           },
           (result) => {
-            if (!result || !result.correct) {
-              err();
-            } else if (result.correct == 1) {
-              target_url = result.url;
-            } else if (result.correct > 0) {
-              Swal.fire({
-                title: "Stay determined...",
-                text: result.message,
-                icon: "success",
-              });
-            } else {
-              err();
-            }
+            handleResult(result);
             waiting_for_ajax = false;
             judge();
             return;
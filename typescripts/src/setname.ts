@@ -1,8 +1,14 @@
 import Swal from "sweetalert2";
 
 declare var solver_name: string;
+declare const static_export: boolean;
 
 function setName(name: string) {
+  if (typeof static_export !== "undefined" && static_export) {
+    // exported pages have no server to remember the name
+    $("#tokenname").html(name);
+    return;
+  }
   $.post(
     "/ajax",
     {